@@ -1,16 +1,17 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, run_db
 from models import User
 from schemas import TokenData
 from config import settings
+from cache import LRUCache
+from hashing import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def verify_password(plain_password, hashed_password):
@@ -29,33 +30,90 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def token_claims(user: User) -> dict:
+    """JWT claims identifying `user` without a database lookup."""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "adm": bool(user.is_admin),
+        "ver": user.token_version or 0,
+    }
+
 def verify_token(token: str, credentials_exception):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(
+            email=email,
+            user_id=payload.get("uid"),
+            is_admin=payload.get("adm"),
+            token_version=payload.get("ver")
+        )
     except JWTError:
         raise credentials_exception
     return token_data
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by route handlers."""
+    id: int
+    email: str
+    is_admin: bool
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_admin=bool(user.is_admin),
+            token_version=user.token_version or 0
+        )
+
+# user id -> Principal, so authenticated requests skip the users table
+principal_cache = LRUCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+def revoke_tokens(db: Session, user_id: int):
+    """Invalidate every token issued to the user so far."""
+    user = db.query(User).filter(User.id == user_id).first()
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    principal_cache.delete(user_id)
+
+def _load_principal(db: Session, token_data: TokenData) -> Optional[Principal]:
+    if token_data.user_id is not None:
+        user = db.query(User).filter(User.id == token_data.user_id).first()
+    else:
+        # Tokens issued before user id claims existed
+        user = db.query(User).filter(User.email == token_data.email).first()
+    return Principal.from_user(user) if user else None
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_data = verify_token(token, credentials_exception)
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    principal = principal_cache.get(token_data.user_id) if token_data.user_id is not None else None
+    if principal is None:
+        principal = await run_db(db, _load_principal, token_data)
+        if principal is None:
+            raise credentials_exception
+        principal_cache.set(principal.id, principal)
+    if (token_data.token_version or 0) != principal.token_version:
         raise credentials_exception
-    return user
+    return principal
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)):
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
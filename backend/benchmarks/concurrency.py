@@ -0,0 +1,84 @@
+"""Closed-loop throughput benchmark for a running API.
+
+Starts N concurrent clients that each issue requests back to back for a fixed
+duration and reports requests/sec and latency percentiles. Used to compare
+the sync and async (DATABASE_ASYNC=true) database paths:
+
+    DATABASE_ASYNC=false uvicorn main:app --port 8000
+    python benchmarks/concurrency.py --path "/jobs/?limit=20" --concurrency 500
+
+For seeded, multi-scenario runs see benchmarks/suite.py.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+import httpx
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def _client(send, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await send()
+            if response.status_code >= 400:
+                errors[str(response.status_code)] += 1
+                continue
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+async def closed_loop(send, concurrency, duration):
+    """Run `concurrency` clients that await `send()` back to back for `duration` seconds.
+
+    `send` is an async callable returning an httpx response; responses with
+    a 4xx/5xx status count as errors, keyed by status code.
+    """
+    latencies, errors = [], Counter()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(send, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_codes": dict(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+async def run(url, path, concurrency, duration, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+        result = await closed_loop(lambda: http.get(path, headers=headers), concurrency, duration)
+    return {"path": path, **result}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/jobs/?limit=20")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+    result = asyncio.run(run(args.url, args.path, args.concurrency, args.duration, args.token))
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
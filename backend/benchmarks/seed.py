@@ -0,0 +1,173 @@
+"""Seed a database with synthetic users, jobs and applications for benchmarking.
+
+Uses DATABASE_URL like the API itself, so the same command seeds SQLite or a
+local PostgreSQL. Run from the backend directory against an empty database:
+
+    DATABASE_URL=sqlite:///./bench.db python benchmarks/seed.py --users 1000 --jobs 20000
+
+Writes a manifest (accounts, password, counts) that benchmarks/suite.py
+reads to drive its scenarios. Output is deterministic for a given --seed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Make the backend modules importable when run as `python benchmarks/seed.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from config import settings
+from database import SessionLocal, engine
+from migrations import migrate
+from models import Application, Job, ResumeBlob, User
+from blobstore import blob_url, resume_key
+from storage import resume_storage
+from crud import upsert_jobs
+from hashing import pwd_context
+import facets
+
+ADMIN_EMAIL = "bench-admin@example.com"
+PASSWORD = "benchmark"
+BATCH_SIZE = 1000
+
+TITLES = [
+    "Software Engineer", "Backend Developer", "Frontend Developer", "Data Scientist",
+    "DevOps Engineer", "Product Manager", "QA Engineer", "Data Engineer",
+    "Site Reliability Engineer", "Machine Learning Engineer", "Mobile Developer", "Designer",
+]
+SENIORITY = ["Junior", "", "Senior", "Staff", "Lead"]
+LOCATIONS = [
+    "New York", "San Francisco", "London", "Berlin", "Remote", "Austin",
+    "Toronto", "Paris", "Amsterdam", "Singapore", "Sydney", "Seattle",
+]
+SKILLS = [
+    "python", "fastapi", "postgresql", "react", "typescript", "kubernetes", "aws",
+    "docker", "sql", "spark", "kafka", "redis", "golang", "rust", "terraform", "pandas",
+]
+STATUSES = ["active"] * 8 + ["inactive", "filled"]
+APPLICATION_STATUSES = ["pending"] * 6 + ["reviewed", "accepted", "rejected"]
+# Smallest valid-looking PDF; every seeded application shares this one blob
+RESUME_BYTES = b"%PDF-1.4\n% benchmark resume\n%%EOF\n"
+
+def _batches(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _description(rng):
+    skills = rng.sample(SKILLS, 4)
+    sentences = [
+        f"We are looking for an engineer experienced with {skills[0]} and {skills[1]}.",
+        f"You will build services using {skills[2]} and work closely with the {skills[3]} team.",
+        "Competitive salary, flexible hours and a friendly team.",
+    ]
+    return " ".join(sentences * rng.randint(1, 6))
+
+def _store_resume():
+    sha256 = hashlib.sha256(RESUME_BYTES).hexdigest()
+    url = blob_url(sha256, ".pdf")
+    key = resume_key(url)
+    if not resume_storage.exists(key):
+        # Same filesystem as UPLOAD_DIR so local storage can move it into place
+        tmp_dir = os.path.join(settings.UPLOAD_DIR, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(RESUME_BYTES)
+        resume_storage.put_file(tmp_path, key)
+    return url, sha256
+
+def seed(users, jobs, applications_per_user, seed_value=42):
+    rng = random.Random(seed_value)
+    migrate(engine)
+    db = SessionLocal()
+    try:
+        if db.execute(select(User.id).where(User.email == ADMIN_EMAIL)).first():
+            raise SystemExit("Database is already seeded; point DATABASE_URL at an empty database")
+
+        # One bcrypt hash shared by every account keeps seeding fast
+        hashed_password = pwd_context.hash(PASSWORD)
+        user_rows = [{
+            "email": ADMIN_EMAIL, "username": "bench-admin",
+            "hashed_password": hashed_password, "is_admin": True,
+        }] + [{
+            "email": f"user{i}@bench.example.com", "username": f"bench-user-{i}",
+            "hashed_password": hashed_password, "is_admin": False,
+        } for i in range(users)]
+        for batch in _batches(user_rows):
+            db.execute(insert(User), batch)
+        db.commit()
+        user_ids = db.execute(
+            select(User.id).where(User.is_admin.is_(False), User.email.like("%@bench.example.com")).order_by(User.id)
+        ).scalars().all()
+
+        job_rows = [{
+            "external_id": f"bench-{i}",
+            "title": " ".join(filter(None, [rng.choice(SENIORITY), rng.choice(TITLES)])),
+            "description": _description(rng),
+            "location": rng.choice(LOCATIONS),
+            "salary": float(rng.randrange(30000, 250000, 1000)),
+            "status": rng.choice(STATUSES),
+        } for i in range(jobs)]
+        for batch in _batches(job_rows):
+            upsert_jobs(db, batch)
+        job_ids = db.execute(
+            select(Job.id).where(Job.external_id.like("bench-%")).order_by(Job.id)
+        ).scalars().all()
+
+        # Only the first half of the users apply, so the apply scenario can use
+        # the second half without hitting "already applied"
+        resume_url, resume_sha256 = _store_resume()
+        applicants = user_ids[:len(user_ids) // 2]
+        application_rows = []
+        for user_id in applicants:
+            for job_id in rng.sample(job_ids, min(applications_per_user, len(job_ids))):
+                application_rows.append({
+                    "user_id": user_id, "job_id": job_id,
+                    "name": f"Applicant {user_id}", "email": f"applicant{user_id}@bench.example.com",
+                    "resume_url": resume_url, "resume_sha256": resume_sha256,
+                    "cover_letter": "I would love to join your team. " * rng.randint(1, 20),
+                    "status": rng.choice(APPLICATION_STATUSES),
+                })
+        for batch in _batches(application_rows):
+            db.execute(insert(Application), batch)
+        db.merge(ResumeBlob(sha256=resume_sha256, size=len(RESUME_BYTES), ref_count=len(application_rows)))
+        facets.reconcile(db)
+        db.commit()
+    finally:
+        db.close()
+
+    return {
+        "admin_email": ADMIN_EMAIL,
+        "password": PASSWORD,
+        "user_email_pattern": "user{}@bench.example.com",
+        "users": users,
+        "applicant_users": len(applicants),
+        "jobs": jobs,
+        "applications": len(application_rows),
+        "seed": seed_value,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--applications-per-user", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    manifest = seed(args.users, args.jobs, args.applications_per_user, args.seed)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Seeded {manifest['users']} users, {manifest['jobs']} jobs and "
+          f"{manifest['applications']} applications in {time.perf_counter() - started:.1f}s; "
+          f"manifest written to {args.manifest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Startup-time benchmark for the API.
+
+Measures, as medians over several runs, how long a fresh interpreter takes
+to import the app, and how long a freshly started server takes until it
+accepts connections and answers its first request:
+
+    DATABASE_URL=sqlite:///./bench.db python benchmarks/startup.py
+    DATABASE_URL=sqlite:///./bench.db python benchmarks/startup.py --server gunicorn --workers 4
+
+Import time is what every worker pays when it is started (once in total
+with gunicorn's preload). "ready" is the time from process start until
+/health/live answers, and "first request" is the latency of the first
+and second GET of --path on that server, i.e. how much work is left to the
+first request after startup.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+def measure_import() -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND)
+    return float(output.decode().strip().splitlines()[-1])
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _server_command(server: str, port: int, workers: int):
+    if server == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app",
+                "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+    return [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers)]
+
+def measure_server(server: str, workers: int, path: str, timeout: float) -> dict:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(_server_command(server, port, workers), cwd=BACKEND,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as http:
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit(f"{server} exited with code {process.returncode}")
+                if time.perf_counter() - started > timeout:
+                    raise SystemExit(f"{server} not ready after {timeout}s")
+                try:
+                    if http.get("/health/live").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.02)
+            ready = time.perf_counter() - started
+            latencies = []
+            for _ in range(2):
+                request_started = time.perf_counter()
+                http.get(path).raise_for_status()
+                latencies.append(time.perf_counter() - request_started)
+    finally:
+        process.terminate()
+        process.wait()
+    return {"ready": ready, "first_request": latencies[0], "second_request": latencies[1]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=["uvicorn", "gunicorn"], default="uvicorn")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--path", default="/jobs/?limit=20", help="Request timed after startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for the server")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    servers = [measure_server(args.server, args.workers, args.path, args.timeout) for _ in range(args.runs)]
+    results = {"import_ms": round(statistics.median(imports) * 1000, 1)}
+    for key in ("ready", "first_request", "second_request"):
+        results[f"{key}_ms"] = round(statistics.median(run[key] for run in servers) * 1000, 1)
+
+    print(f"{'import':>10} {'ready':>10} {'1st req':>10} {'2nd req':>10}   ({args.server}, "
+          f"{args.workers} worker(s), median of {args.runs})")
+    print(f"{results['import_ms']:>8}ms {results['ready_ms']:>8}ms "
+          f"{results['first_request_ms']:>8}ms {results['second_request_ms']:>8}ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"server": args.server, "workers": args.workers, "path": args.path,
+                       "runs": args.runs, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Scenario benchmark suite for a running API.
+
+Drives realistic traffic mixes against a database seeded by
+benchmarks/seed.py and reports requests/sec and p50/p95/p99 latency per
+scenario. Results can be saved as a JSON baseline and later runs compared
+against it to catch regressions:
+
+    DATABASE_URL=sqlite:///./bench.db python benchmarks/seed.py
+    DATABASE_URL=sqlite:///./bench.db uvicorn main:app --port 8000
+    python benchmarks/suite.py --save-baseline baseline.json
+    # change code, restart the server, then
+    python benchmarks/suite.py --baseline baseline.json
+
+Scenarios: browse (anonymous listing, detail and facets), search (full-text
+and filtered search), login (login storm), apply (application with resume
+upload) and admin (application review and dashboard).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import httpx
+from concurrency import closed_loop
+
+SEARCH_TERMS = ["python", "react", "kubernetes", "data", "senior engineer", "backend", "aws", "designer"]
+LOCATIONS = ["New York", "London", "Remote", "Berlin", "San Francisco"]
+REVIEW_STATUSES = ["reviewed", "accepted", "rejected"]
+RESUME = ("resume.pdf", b"%PDF-1.4\n% benchmark upload\n%%EOF\n", "application/pdf")
+
+async def _login(http, email, password):
+    response = await http.post("/auth/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def _fetch_all(http, path, params=None, headers=None):
+    """Every item of a cursor-paginated listing."""
+    items, cursor = [], ""
+    while cursor is not None:
+        response = await http.get(path, params={**(params or {}), "limit": 1000, "cursor": cursor},
+                                  headers=headers)
+        response.raise_for_status()
+        page = response.json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+    return items
+
+async def setup(http, manifest, apply_users):
+    """Log in the accounts the scenarios need and collect ids to request."""
+    admin = await _login(http, manifest["admin_email"], manifest["password"])
+    jobs = await _fetch_all(http, "/jobs/", {"lean": "true", "snippet_length": 0})
+    job_ids = [job["id"] for job in jobs]
+    applications = await _fetch_all(http, "/applications/", headers=admin)
+    # Users after the seeded applicants have not applied anywhere yet
+    first = manifest["applicant_users"]
+    last = min(manifest["users"], first + apply_users)
+    applicants = []
+    for i in range(first, last):
+        headers = await _login(http, manifest["user_email_pattern"].format(i), manifest["password"])
+        # Earlier runs may already have applied with this account
+        applied = await _fetch_all(http, "/applications/", headers=headers)
+        applicants.append((headers, {application["job_id"] for application in applied}))
+    return {
+        "manifest": manifest,
+        "admin": admin,
+        "job_ids": job_ids,
+        "application_ids": [application["id"] for application in applications],
+        "reviewed_job_ids": sorted({application["job_id"] for application in applications}) or job_ids,
+        "applicants": applicants,
+    }
+
+def browse(http, ctx, rng):
+    job_ids = ctx["job_ids"]
+    pages = max(1, len(job_ids) - 50)
+
+    def send():
+        roll = rng.random()
+        if roll < 0.5:
+            return http.get("/jobs/", params={"limit": 20, "skip": rng.randrange(pages)})
+        if roll < 0.6:
+            return http.get("/jobs/", params={"lean": "true", "limit": 50, "skip": rng.randrange(pages)})
+        if roll < 0.9:
+            return http.get(f"/jobs/{rng.choice(job_ids)}")
+        return http.get("/jobs/facets")
+    return send
+
+def search(http, ctx, rng):
+    def send():
+        params = {"limit": 20}
+        roll = rng.random()
+        if roll < 0.5:
+            params["q"] = rng.choice(SEARCH_TERMS)
+        if roll > 0.3:
+            params["location"] = rng.choice(LOCATIONS)
+        if roll > 0.6:
+            params["min_salary"] = rng.randrange(40000, 150000, 10000)
+            params["status"] = "active"
+        return http.get("/jobs/", params=params)
+    return send
+
+def login(http, ctx, rng):
+    manifest = ctx["manifest"]
+
+    def send():
+        email = manifest["user_email_pattern"].format(rng.randrange(manifest["users"]))
+        return http.post("/auth/token", data={"username": email, "password": manifest["password"]})
+    return send
+
+def apply(http, ctx, rng):
+    if not ctx["applicants"]:
+        raise SystemExit("apply scenario needs unseeded users; seed with more --users")
+
+    # Walk (user, job) pairs in order, skipping ones that already applied
+    def pairs():
+        for job_id in ctx["job_ids"]:
+            for headers, applied in ctx["applicants"]:
+                if job_id not in applied:
+                    yield headers, job_id
+    remaining = pairs()
+
+    def send():
+        headers, job_id = next(remaining)
+        return http.post(
+            "/applications/",
+            data={"job_id": str(job_id), "name": "Benchmark Applicant", "email": "bench@example.com"},
+            files={"resume": RESUME},
+            headers=headers
+        )
+    return send
+
+def admin(http, ctx, rng):
+    headers = ctx["admin"]
+
+    def send():
+        roll = rng.random()
+        if roll < 0.4:
+            return http.get(f"/applications/job/{rng.choice(ctx['reviewed_job_ids'])}",
+                            params={"limit": 50}, headers=headers)
+        if roll < 0.6:
+            return http.get(f"/applications/job/{rng.choice(ctx['reviewed_job_ids'])}",
+                            params={"limit": 50, "status": "pending"}, headers=headers)
+        if roll < 0.8 and ctx["application_ids"]:
+            return http.put(f"/applications/{rng.choice(ctx['application_ids'])}",
+                            json={"status": rng.choice(REVIEW_STATUSES)}, headers=headers)
+        return http.get("/admin/stats", headers=headers)
+    return send
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "login": login,
+    "apply": apply,
+    "admin": admin,
+}
+
+def compare(results, baseline, threshold):
+    """Return a list of regressions: rps down or p95 up by more than `threshold` percent."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if previous["rps"] and (previous["rps"] - result["rps"]) / previous["rps"] * 100 > threshold:
+            regressions.append(f"{name}: rps {previous['rps']} -> {result['rps']}")
+        if previous["p95_ms"] and (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 > threshold:
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+    return regressions
+
+def _print_table(results, baseline):
+    print(f"{'scenario':<10} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}  vs baseline")
+    for name, result in results.items():
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        delta = ""
+        if previous and previous["rps"]:
+            delta = f"rps {(result['rps'] / previous['rps'] - 1) * 100:+.1f}%"
+            if previous["p95_ms"]:
+                delta += f", p95 {(result['p95_ms'] / previous['p95_ms'] - 1) * 100:+.1f}%"
+        print(f"{name:<10} {result['rps']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['p99_ms']:>9} {result['errors']:>7}  {delta}")
+
+async def run(args, manifest):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as http:
+        ctx = await setup(http, manifest, args.apply_users)
+        for name in args.scenarios:
+            send = SCENARIOS[name](http, ctx, random.Random(args.seed))
+            if args.warmup:
+                await closed_loop(send, args.concurrency, args.warmup)
+            results[name] = await closed_loop(send, args.concurrency, args.duration)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json", help="Written by benchmarks/seed.py")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [name.strip() for name in value.split(",") if name.strip()])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--apply-users", type=int, default=20, help="Accounts the apply scenario logs in")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--save-baseline", help="Write results as the baseline file")
+    parser.add_argument("--baseline", help="Compare against this baseline; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=10, help="Allowed regression in percent")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = asyncio.run(run(args, manifest))
+    report = {
+        "meta": {
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+            "dataset": {key: manifest[key] for key in ("users", "jobs", "applications")},
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "scenarios": results,
+    }
+    _print_table(results, baseline)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import time
+from typing import Optional, Tuple
+from fastapi import UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from config import settings
+from models import Application, ResumeBlob, ResumeText
+from storage import resume_storage
+from uploads import TEMP_SUFFIX, stream_upload
+import search
+
+# Content-addressed resume storage.
+# Resumes are stored under the key blobs/<aa>/<sha256><ext> in resume_storage,
+# so identical uploads share one object. resume_blobs.ref_count tracks how many
+# applications use each blob; collect_garbage() reconciles the counts and
+# deletes unreferenced objects.
+
+BLOB_PREFIX = "blobs/"
+URL_PREFIX = "/uploads/"
+
+def _tmp_dir() -> str:
+    return os.path.join(settings.UPLOAD_DIR, "tmp")
+
+def blob_url(sha256: str, extension: str) -> str:
+    return f"{URL_PREFIX}{BLOB_PREFIX}{sha256[:2]}/{sha256}{extension.lower()}"
+
+def resume_key(resume_url: str) -> Optional[str]:
+    """Storage key for a resume_url, or None if the url is not a stored resume."""
+    if not resume_url or not resume_url.startswith(URL_PREFIX):
+        return None
+    key = resume_url[len(URL_PREFIX):]
+    if not key or key.startswith("/") or ".." in key.split("/"):
+        return None
+    return key
+
+def _store_file(tmp_path: str, key: str):
+    if resume_storage.exists(key):
+        # Already stored; keep the existing copy and refresh its age for GC
+        os.remove(tmp_path)
+        resume_storage.touch(key)
+    else:
+        resume_storage.put_file(tmp_path, key)
+
+async def store_resume(upload: UploadFile, extension: str) -> Tuple[str, str, int]:
+    """Stream an upload into the blob store. Returns (resume_url, sha256, size)."""
+    tmp_path, sha256, size = await stream_upload(
+        upload,
+        _tmp_dir(),
+        max_bytes=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE
+    )
+    url = blob_url(sha256, extension)
+    try:
+        await run_in_threadpool(_store_file, tmp_path, resume_key(url))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return url, sha256, size
+
+def collect_garbage(db: Session, grace_seconds: int = 3600) -> dict:
+    """Reconcile reference counts and delete blobs no application refers to.
+
+    Objects younger than `grace_seconds` are kept, since an upload may have
+    stored them without having committed its application yet.
+    """
+    db.query(ResumeBlob).update(
+        {ResumeBlob.ref_count: select(func.count()).where(
+            Application.resume_sha256 == ResumeBlob.sha256
+        ).scalar_subquery()},
+        synchronize_session=False
+    )
+    db.commit()
+    referenced = set(db.execute(
+        select(ResumeBlob.sha256).where(ResumeBlob.ref_count > 0)
+    ).scalars())
+
+    cutoff = time.time() - grace_seconds
+    kept = set()
+    removed_files = 0
+    freed_bytes = 0
+    for key, size, modified in list(resume_storage.iter_objects(BLOB_PREFIX)):
+        sha256 = key.rsplit("/", 1)[-1].split(".")[0]
+        if sha256 in referenced or modified > cutoff:
+            kept.add(sha256)
+            continue
+        resume_storage.delete(key)
+        freed_bytes += size
+        removed_files += 1
+
+    # Temporary files left behind by crashed uploads
+    if os.path.isdir(_tmp_dir()):
+        for filename in os.listdir(_tmp_dir()):
+            path = os.path.join(_tmp_dir(), filename)
+            if filename.endswith(TEMP_SUFFIX) and os.path.getmtime(path) <= cutoff:
+                freed_bytes += os.path.getsize(path)
+                os.remove(path)
+                removed_files += 1
+
+    removed = []
+    for blob in db.query(ResumeBlob).filter(ResumeBlob.ref_count == 0):
+        if blob.sha256 not in kept:
+            db.delete(blob)
+            removed.append(blob.sha256)
+    # Extracted text goes with its file
+    db.query(ResumeText).filter(ResumeText.sha256.in_(removed)).delete(synchronize_session=False)
+    search.remove_resume_texts(db, removed)
+    db.commit()
+    removed_blobs = len(removed)
+    return {"removed_files": removed_files, "freed_bytes": freed_bytes, "removed_blobs": removed_blobs}
+
+if __name__ == "__main__":
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        print(collect_garbage(db))
+    finally:
+        db.close()
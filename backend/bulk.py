@@ -0,0 +1,154 @@
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from crud import upsert_jobs_async
+from database import replicas
+from models import Job
+from schemas import JobImport
+
+# Bulk job import and export for partner feeds.
+# Imports parse NDJSON or CSV straight off the request stream and upsert
+# validated rows in batches; exports stream rows from a server-side cursor.
+# Neither direction holds the whole feed in memory.
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_COLUMNS = (
+    "id", "external_id", "title", "description", "location", "salary", "status", "created_at", "updated_at"
+)
+MAX_REPORTED_ERRORS = 100
+
+def format_for_content_type(content_type: str) -> Optional[str]:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines"):
+        return "ndjson"
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    return None
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # Lines keep their "\n" so multi-line quoted CSV fields can be rejoined
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+async def _ndjson_records(chunks) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+async def _csv_records(chunks) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    header = None
+    pending = ""
+    start = line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not pending:
+            start = line_number
+        pending += line
+        # Quotes are escaped by doubling, so an odd count means a quoted
+        # field continues on the next line
+        if pending.count('"') % 2:
+            continue
+        values, pending = next(csv.reader([pending]), []), ""
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the field defaults
+        yield start, {name: value for name, value in zip(header, values) if value != ""}, None
+    if pending:
+        yield start, None, "Unterminated quoted field"
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+    )
+
+async def import_jobs(db, chunks: AsyncIterator[bytes], fmt: str, batch_size: int = 1000) -> dict:
+    """Validate and upsert jobs from an NDJSON or CSV byte stream.
+
+    Each batch is committed on its own, so rows before a failing batch stay
+    imported. Invalid rows are skipped and reported by line number.
+    """
+    records = _ndjson_records(chunks) if fmt == "ndjson" else _csv_records(chunks)
+    imported = failed = 0
+    errors = []
+    batch = []
+    async for line_number, record, error in records:
+        if error is None:
+            try:
+                batch.append(JobImport.model_validate(record).model_dump())
+            except ValidationError as e:
+                error = _format_validation_error(e)
+        if error is not None:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": error})
+            continue
+        if len(batch) >= batch_size:
+            imported += await upsert_jobs_async(db, batch)
+            batch = []
+    if batch:
+        imported += await upsert_jobs_async(db, batch)
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _ndjson_chunk(rows) -> bytes:
+    return "".join(
+        json.dumps({name: _export_value(value) for name, value in zip(EXPORT_COLUMNS, row)}) + "\n"
+        for row in rows
+    ).encode()
+
+def _csv_chunk(rows) -> bytes:
+    out = io.StringIO()
+    csv.writer(out).writerows([_export_value(value) for value in row] for row in rows)
+    return out.getvalue().encode()
+
+def export_jobs(fmt: str, batch_size: int = 1000) -> Iterator[bytes]:
+    """Yield all jobs as NDJSON or CSV, one chunk per `batch_size` rows.
+
+    Runs on its own connection with a server-side cursor, on a read replica
+    when one is configured, so it outlives the request session and never
+    loads the whole table.
+    """
+    encode = _ndjson_chunk if fmt == "ndjson" else _csv_chunk
+    if fmt == "csv":
+        yield _csv_chunk([EXPORT_COLUMNS])
+    with replicas.read_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            select(*(getattr(Job, name) for name in EXPORT_COLUMNS)).order_by(Job.id)
+        )
+        for rows in result.partitions():
+            yield encode(rows)
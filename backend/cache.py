@@ -0,0 +1,132 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+from config import settings
+
+# Read-through response cache for public job endpoints.
+# Values are pre-serialized JSON bytes so a hit skips both the database and
+# Pydantic. Writes invalidate a whole namespace at once: the in-process LRU is
+# cleared, the Redis backend bumps a generation counter that is part of every key.
+# A value is stored under the generation seen by the get() that missed in the
+# same request, so a body computed before an invalidation is never cached
+# after it.
+
+logger = logging.getLogger(__name__)
+
+def cache_key(*parts) -> str:
+    """Serialize a tuple of request parameters into a cache key."""
+    return json.dumps(parts, separators=(",", ":"))
+
+def fold(value: Optional[str]) -> Optional[str]:
+    """Normalize a case-insensitive parameter (search text, location) for cache_key()."""
+    return value.lower() if value is not None else None
+
+class NullCache:
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes):
+        pass
+
+    def invalidate(self):
+        pass
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL. Holds any value."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._read_generation = ContextVar(f"lru_cache_{id(self)}", default=None)
+
+    def get(self, key):
+        with self._lock:
+            self._read_generation.set(self._generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if self._read_generation.get() not in (None, self._generation):
+                # Invalidated since this request's get(); the value may be stale
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+class RedisCache:
+    """Redis-backed cache shared by all API replicas.
+
+    `client` is any redis-py compatible client (fakeredis works in tests).
+    Redis errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, client, namespace: str, ttl: float = 60):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self._read_generation = ContextVar(f"redis_cache_{namespace}_{id(self)}", default=None)
+
+    def _generation(self) -> int:
+        return int(self.client.get(f"{self.namespace}:generation") or 0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            generation = self._generation()
+            self._read_generation.set(generation)
+            return self.client.get(f"{self.namespace}:{generation}:{key}")
+        except Exception as e:
+            logger.warning("Cache read failed: %s", e)
+            return None
+
+    def set(self, key: str, value: bytes):
+        try:
+            generation = self._read_generation.get()
+            if generation is None:
+                generation = self._generation()
+            self.client.set(f"{self.namespace}:{generation}:{key}", value, ex=int(self.ttl))
+        except Exception as e:
+            logger.warning("Cache write failed: %s", e)
+
+    def invalidate(self):
+        # Old generations are never read again and expire through their TTL
+        try:
+            self.client.incr(f"{self.namespace}:generation")
+        except Exception as e:
+            logger.warning("Cache invalidation failed: %s", e)
+
+def build_cache(namespace: str):
+    backend = settings.CACHE_BACKEND
+    if backend == "redis":
+        import redis
+        client = redis.Redis.from_url(settings.REDIS_URL)
+        return RedisCache(client, namespace, ttl=settings.CACHE_TTL_SECONDS)
+    if backend == "memory":
+        return LRUCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
+    return NullCache()
+
+job_cache = build_cache("jobs")
@@ -0,0 +1,148 @@
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; responses fall back to gzip
+    brotli = None
+
+# Negotiated response compression.
+# Picks brotli or gzip from Accept-Encoding and compresses text-like bodies of
+# at least `minimum_size` bytes, including streamed exports. Resume downloads
+# are left alone: PDFs are already compressed and byte ranges must refer to
+# the stored file. A plain ASGI wrapper: it only relies on Starlette's public
+# header helpers, not on the internals of its GZipMiddleware.
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml", "text/",
+)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The best supported coding the client accepts ("br" or "gzip"), or None for identity."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    # Brotli wins ties: smaller output at comparable speed for JSON
+    def quality(coding):
+        return qualities.get(coding, qualities.get("*", 0.0))
+
+    best = max((["br"] if brotli is not None else []) + ["gzip"], key=quality)
+    return best if quality(best) > 0 else None
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: a gzip container rather than a raw zlib stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        body = self._compressor.compress(body)
+        return body + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        body = self._compressor.process(body)
+        return body + (self._compressor.flush() if more_body else self._compressor.finish())
+
+class _Responder:
+    """Compresses one response with `compressor` (None: only adds Vary).
+
+    The response start is held back until the first body chunk shows whether
+    the body is big enough, or streamed, and so worth compressing.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, coding: Optional[str], compressor):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.coding = coding
+        self.compressor = compressor
+        self.send: Send = None
+        self.start: Optional[Message] = None
+        self.excluded = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.excluded = (
+                "content-encoding" in headers or "content-range" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            )
+            self.start = message
+            return
+        if message_type != "http.response.body":
+            # e.g. http.response.pathsend for files
+            await self._flush_start()
+            await self.send(message)
+            return
+        if self.start is None:
+            # Later chunks of a streamed body
+            if not self.excluded:
+                message["body"] = self.compressor.compress(message.get("body", b""), message.get("more_body", False))
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.excluded or (len(body) < self.minimum_size and not more_body):
+            await self._flush_start()
+            await self.send(message)
+            return
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.compressor is not None:
+            message["body"] = self.compressor.compress(body, more_body)
+            headers["Content-Encoding"] = self.coding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        else:
+            # Identity: later chunks pass through untouched
+            self.excluded = True
+        await self._flush_start()
+        await self.send(message)
+
+    async def _flush_start(self):
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding == "br":
+            compressor = _BrotliCompressor(self.brotli_quality)
+        elif coding == "gzip":
+            compressor = _GzipCompressor(self.gzip_level)
+        else:
+            # Still marks large responses with Vary: Accept-Encoding
+            compressor = None
+        await _Responder(self.app, self.minimum_size, coding, compressor)(scope, receive, send)
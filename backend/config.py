@@ -8,6 +8,98 @@ class Settings:
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./job_board.db")
+    # Serve requests through an AsyncEngine (asyncpg / aiosqlite)
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+    # Comma-separated read replica URLs for read-only endpoints. Replicas that
+    # lose or refuse connections are skipped for REPLICA_EJECT_SECONDS; after
+    # a job write, reads go to the primary for REPLICA_STICKY_SECONDS
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_EJECT_SECONDS: float = float(os.getenv("REPLICA_EJECT_SECONDS", "30"))
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # Connection pool (PostgreSQL and file-backed SQLite); DB_STATEMENT_TIMEOUT_MS
+    # applies to PostgreSQL only, 0 disables it
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # SQLite pragmas: WAL lets readers run alongside the writer
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # /health/ready reports 503 above this pool usage (fraction of size +
+    # overflow) or database round-trip time
+    HEALTH_POOL_SATURATION: float = float(os.getenv("HEALTH_POOL_SATURATION", "0.9"))
+    HEALTH_MAX_DB_LATENCY_MS: float = float(os.getenv("HEALTH_MAX_DB_LATENCY_MS", "500"))
+    # Apply pending schema migrations when the app starts. gunicorn.conf.py
+    # runs them once in the master process instead of in every worker
+    MIGRATE_ON_STARTUP: bool = os.getenv("MIGRATE_ON_STARTUP", "true").lower() == "true"
+    # Gunicorn (gunicorn.conf.py): worker processes (0 = one per available
+    # CPU), seconds a worker gets to finish in-flight requests on restart or
+    # shutdown, and requests after which a worker is replaced (0 = never)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+    MAX_REQUESTS: int = int(os.getenv("MAX_REQUESTS", "0"))
+    # Response compression (brotli when installed, else gzip) for text-like
+    # bodies of at least COMPRESSION_MINIMUM_SIZE bytes
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    # Add X-SQL-Query-Count / X-SQL-Query-Time-Ms headers to every response
+    SQL_DEBUG_HEADERS: bool = os.getenv("SQL_DEBUG_HEADERS", "false").lower() == "true"
+    # Prometheus metrics on /metrics, Server-Timing response headers, and a
+    # warning log for SQL statements slower than SLOW_QUERY_MS (0 disables)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_HEADERS: bool = os.getenv("SERVER_TIMING_HEADERS", "false").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+    # Background text extraction from PDF/DOCX resumes for applicant keyword
+    # filtering: "local" queue in each API process or "redis" (served by
+    # `python resumetext.py worker`); WORKERS is the extraction process pool size
+    RESUME_TEXT_ENABLED: bool = os.getenv("RESUME_TEXT_ENABLED", "true").lower() == "true"
+    RESUME_TEXT_QUEUE: str = os.getenv("RESUME_TEXT_QUEUE", "local")
+    RESUME_TEXT_WORKERS: int = int(os.getenv("RESUME_TEXT_WORKERS", "2"))
+    RESUME_TEXT_TIMEOUT_SECONDS: float = float(os.getenv("RESUME_TEXT_TIMEOUT_SECONDS", "60"))
+    RESUME_TEXT_MAX_CHARS: int = int(os.getenv("RESUME_TEXT_MAX_CHARS", "100000"))
+    # Width of the salary histogram buckets in GET /jobs/facets; run
+    # `python facets.py` after changing it to rebuild the counters
+    FACET_SALARY_BUCKET_SIZE: int = int(os.getenv("FACET_SALARY_BUCKET_SIZE", "25000"))
+    # Similar/recommended jobs: hashed TF-IDF dimensions (vectors are sparse,
+    # so many dimensions keep hash collisions rare at no memory cost), the
+    # snapshot workers load on startup (empty disables it) and how often a
+    # worker reads job changes made by other processes
+    SIMILAR_JOBS_DIMENSIONS: int = int(os.getenv("SIMILAR_JOBS_DIMENSIONS", str(2 ** 18)))
+    SIMILAR_JOBS_INDEX_PATH: str = os.getenv("SIMILAR_JOBS_INDEX_PATH", "job_index.npz")
+    SIMILAR_JOBS_REFRESH_SECONDS: float = float(os.getenv("SIMILAR_JOBS_REFRESH_SECONDS", "30"))
+    # Rows per batch for bulk job imports (POST /jobs/bulk), per fetch for
+    # exports and per UPDATE for PATCH /applications/bulk
+    BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+    # Resume storage: "local" (UPLOAD_DIR) or "s3" (any S3-compatible store;
+    # credentials come from the standard AWS environment variables)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")
+    S3_BUCKET: str = os.getenv("S3_BUCKET", "job-board-resumes")
+    S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")
+    S3_REGION: str = os.getenv("S3_REGION", "")
+    S3_PRESIGNED_URLS: bool = os.getenv("S3_PRESIGNED_URLS", "true").lower() == "true"
+    S3_PRESIGN_EXPIRES_SECONDS: int = int(os.getenv("S3_PRESIGN_EXPIRES_SECONDS", "300"))
+    # Response cache for public job endpoints: "memory", "redis" or "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Authenticated principals cached per user id; revocations reach other
+    # replicas once their cached entry expires
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    # Password hashing executor: "thread" or "process"; logins and
+    # registrations beyond PASSWORD_HASH_MAX_PENDING get a 429
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -1,16 +1,31 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from models import User, Job, Application
-from schemas import UserCreate, JobCreate, JobUpdate, ApplicationCreate, ApplicationUpdate
-from auth import get_password_hash, verify_password
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, false, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from database import is_postgres, replicas, run_db
+from models import User, Job, Application, ResumeBlob, ResumeText, JobApplicationCount, JobFacet, ChangeVersion
+from schemas import UserCreate, JobCreate, JobUpdate, ApplicationCreate, ApplicationUpdate, ApplicationBulkUpdate
+from auth import get_password_hash
+from hashing import password_hasher
+from pagination import keyset_after
+import search
+import facets
+from collections import Counter
+from cache import job_cache
+from recommendations import job_index
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
 # User CRUD operations
+def get_user(db: Session, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -21,41 +36,141 @@ def create_user(db: Session, user: UserCreate):
     db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
+def set_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+
+async def authenticate_user(db: Session, email: str, password: str):
+    """Check credentials with bcrypt running on the hashing executor.
+
+    Hashes created with outdated parameters are transparently upgraded.
+    Raises HashingBusy when the executor is saturated.
+    """
+    user = await run_db(db, get_user_by_email, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not verified:
         return False
+    if new_hash:
+        await run_db(db, set_password_hash, user, new_hash)
     return user
 
 # Job CRUD operations
-def get_jobs(db: Session, skip: int = 0, limit: int = 100, 
-             location: Optional[str] = None, 
-             min_salary: Optional[float] = None,
-             max_salary: Optional[float] = None,
-             status: Optional[str] = None):
-    query = db.query(Job)
-    
+def _filter_jobs(query, location: Optional[str] = None,
+                 min_salary: Optional[float] = None,
+                 max_salary: Optional[float] = None,
+                 status: Optional[str] = None):
     if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
+        # The substring match runs over the location facet (one row per
+        # distinct location); the jobs are then found through ix_jobs_location
+        matching = select(JobFacet.value).where(
+            JobFacet.facet == "location", JobFacet.value.ilike(f"%{location}%")
+        )
+        query = query.filter(Job.location.in_(matching))
     if min_salary is not None:
         query = query.filter(Job.salary >= min_salary)
     if max_salary is not None:
         query = query.filter(Job.salary <= max_salary)
     if status:
         query = query.filter(Job.status == status)
-    
+    return query
+
+def get_jobs(db: Session, skip: int = 0, limit: int = 100, 
+             location: Optional[str] = None, 
+             min_salary: Optional[float] = None,
+             max_salary: Optional[float] = None,
+             status: Optional[str] = None):
+    query = _filter_jobs(db.query(Job), location, min_salary, max_salary, status)
     return query.offset(skip).limit(limit).all()
 
+def get_jobs_after(db: Session, after: Optional[Tuple[datetime, int]] = None, limit: int = 100,
+                   location: Optional[str] = None,
+                   min_salary: Optional[float] = None,
+                   max_salary: Optional[float] = None,
+                   status: Optional[str] = None):
+    """Keyset page of jobs ordered by (created_at, id), starting after `after`."""
+    query = _filter_jobs(db.query(Job), location, min_salary, max_salary, status)
+    if after:
+        query = query.filter(keyset_after(Job, after))
+    return query.order_by(Job.created_at, Job.id).limit(limit).all()
+
+def _job_summary_columns(snippet_length: int):
+    # The description is cut down in SQL so the full Text never leaves the database
+    return (
+        Job.id, Job.title, Job.location, Job.salary, Job.status,
+        func.substr(Job.description, 1, snippet_length).label("description"),
+        Job.created_at, Job.updated_at
+    )
+
+def get_job_summaries(db: Session, skip: int = 0, limit: int = 100, snippet_length: int = 200,
+                      location: Optional[str] = None,
+                      min_salary: Optional[float] = None,
+                      max_salary: Optional[float] = None,
+                      status: Optional[str] = None):
+    """Lean job listing as plain rows (no ORM objects) with truncated descriptions."""
+    query = _filter_jobs(select(*_job_summary_columns(snippet_length)), location, min_salary, max_salary, status)
+    return db.execute(query.offset(skip).limit(limit)).all()
+
+def get_job_summaries_after(db: Session, after: Optional[Tuple[datetime, int]] = None, limit: int = 100,
+                            snippet_length: int = 200,
+                            location: Optional[str] = None,
+                            min_salary: Optional[float] = None,
+                            max_salary: Optional[float] = None,
+                            status: Optional[str] = None):
+    """Keyset page of lean job rows ordered by (created_at, id)."""
+    query = _filter_jobs(select(*_job_summary_columns(snippet_length)), location, min_salary, max_salary, status)
+    if after:
+        query = query.filter(keyset_after(Job, after))
+    return db.execute(query.order_by(Job.created_at, Job.id).limit(limit)).all()
+
+def search_jobs(db: Session, q: str, skip: int = 0, limit: int = 100,
+                location: Optional[str] = None,
+                min_salary: Optional[float] = None,
+                max_salary: Optional[float] = None,
+                status: Optional[str] = None):
+    """Full-text search returning (job, rank, title_highlight, snippet) rows, best match first."""
+    query = search.search_query(db, q)
+    if query is None:
+        return []
+    query = _filter_jobs(query, location, min_salary, max_salary, status)
+    return [
+        (job, rank, search.render_highlight(title_highlight), search.render_highlight(snippet))
+        for job, rank, title_highlight, snippet in query.offset(skip).limit(limit).all()
+    ]
+
+def get_job_facets(db: Session):
+    return facets.get_facets(db)
+
+def _jobs_changed():
+    # Read from the primary until replicas have caught up, so the cache is
+    # not refilled with rows from before the write
+    replicas.stick_to_primary()
+    job_cache.invalidate()
+
+def get_jobs_version(db: Session) -> str:
+    """Token that changes with every committed job write (change_versions)."""
+    return str(db.scalar(select(ChangeVersion.version).where(ChangeVersion.name == "jobs")))
+
+def get_applications_version(db: Session) -> str:
+    """Token that changes with every committed application write and the jobs they embed."""
+    versions = facets.get_versions(db)
+    return f"{versions.get('applications')}:{versions.get('jobs')}"
+
 def get_job(db: Session, job_id: int):
     return db.query(Job).filter(Job.id == job_id).first()
 
 def create_job(db: Session, job: JobCreate):
     db_job = Job(**job.dict())
     db.add(db_job)
+    db.flush()
+    search.index_job(db, db_job)
+    facets.apply_deltas(db, Counter(facets.job_facet_keys(db_job)))
+    facets.bump_versions(db, "jobs")
     db.commit()
+    _jobs_changed()
     db.refresh(db_job)
+    job_index.upsert(db_job.id, db_job.title, db_job.description, db_job.status)
     return db_job
 
 def update_job(db: Session, job_id: int, job: JobUpdate):
@@ -63,12 +178,21 @@ def update_job(db: Session, job_id: int, job: JobUpdate):
     if not db_job:
         return None
     
+    old_facets = facets.job_facet_keys(db_job)
     update_data = job.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_job, field, value)
     
+    if "title" in update_data or "description" in update_data:
+        search.index_job(db, db_job)
+    deltas = Counter(facets.job_facet_keys(db_job))
+    deltas.subtract(old_facets)
+    facets.apply_deltas(db, deltas)
+    facets.bump_versions(db, "jobs")
     db.commit()
+    _jobs_changed()
     db.refresh(db_job)
+    job_index.upsert(db_job.id, db_job.title, db_job.description, db_job.status)
     return db_job
 
 def delete_job(db: Session, job_id: int):
@@ -76,21 +200,145 @@ def delete_job(db: Session, job_id: int):
     if not db_job:
         return False
     
+    deltas = Counter()
+    deltas.subtract(facets.job_facet_keys(db_job))
+    db.query(JobApplicationCount).filter(JobApplicationCount.job_id == job_id).delete(synchronize_session=False)
     db.delete(db_job)
+    search.remove_job(db, job_id)
+    facets.apply_deltas(db, deltas)
+    # Its applications lose their job
+    facets.bump_versions(db, "jobs", "applications")
     db.commit()
+    _jobs_changed()
+    job_index.remove(job_id)
     return True
 
+def upsert_jobs(db: Session, jobs: List[dict]) -> int:
+    """Insert a batch of validated job dicts, updating existing jobs with the same external_id.
+
+    The whole batch goes out as one executemany statement and one commit.
+    Returns the number of jobs written.
+    """
+    # A key may only be written once per upsert statement, so the last occurrence wins
+    unique = {}
+    for i, job in enumerate(jobs):
+        unique[job["external_id"] if job.get("external_id") is not None else i] = job
+    if not unique:
+        return 0
+
+    # Facet deltas: the rows being replaced come out, the new values go in
+    deltas = Counter()
+    external_ids = [key for key in unique if isinstance(key, str)]
+    if external_ids:
+        existing = db.execute(
+            select(Job.status, Job.location, Job.salary)
+            .where(Job.external_id.in_(external_ids))
+            .with_for_update()
+        )
+        for row in existing:
+            deltas.subtract(facets.facet_keys(*row))
+    for job in unique.values():
+        deltas.update(facets.facet_keys(job["status"], job["location"], job["salary"]))
+
+    insert = postgresql.insert if is_postgres(db.get_bind()) else sqlite.insert
+    stmt = insert(Job)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.external_id],
+        set_={
+            **{name: stmt.excluded[name] for name in ("title", "description", "location", "salary", "status")},
+            "updated_at": func.now(),
+        }
+    )
+    job_ids = db.scalars(stmt.returning(Job.id), list(unique.values())).all()
+    search.index_jobs(db, job_ids)
+    facets.apply_deltas(db, deltas)
+    facets.bump_versions(db, "jobs")
+    db.commit()
+    _jobs_changed()
+    job_index.mark_stale()
+    return len(job_ids)
+
+# Similar and recommended jobs
+def _active_jobs_in_order(db: Session, scored: List[Tuple[int, float]]):
+    if not scored:
+        return []
+    jobs = {
+        job.id: job
+        for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in scored]), Job.status == "active")
+    }
+    return [(jobs[job_id], score) for job_id, score in scored if job_id in jobs]
+
+def get_similar_jobs(db: Session, job_id: int, limit: int = 10):
+    """(job, score) pairs for the active jobs most like `job_id`, or None if the job does not exist."""
+    job_index.ensure_current(db)
+    # Over-fetch: jobs closed or deleted by other processes may still be indexed
+    scored = job_index.similar(job_id, 2 * limit)
+    if scored is None:
+        # Created by another process since the last sync
+        job = get_job(db, job_id)
+        if job is None:
+            return None
+        job_index.upsert(job.id, job.title, job.description, job.status)
+        scored = job_index.similar(job_id, 2 * limit) or []
+    return _active_jobs_in_order(db, scored)[:limit]
+
+def get_recommended_jobs(db: Session, user_id: int, limit: int = 10):
+    """(job, score) pairs for active jobs like the ones the user applied for, excluding those."""
+    job_index.ensure_current(db)
+    applied = db.scalars(
+        select(Application.job_id).where(Application.user_id == user_id, Application.job_id.isnot(None))
+    ).all()
+    return _active_jobs_in_order(db, job_index.recommend(applied, 2 * limit))[:limit]
+
 # Application CRUD operations
 def get_applications(db: Session, skip: int = 0, limit: int = 100, user_id: Optional[int] = None):
-    query = db.query(Application)
+    query = db.query(Application).options(joinedload(Application.job))
     if user_id:
         query = query.filter(Application.user_id == user_id)
     return query.offset(skip).limit(limit).all()
 
+def get_applications_after(db: Session, after: Optional[Tuple[datetime, int]] = None,
+                           limit: int = 100, user_id: Optional[int] = None):
+    """Keyset page of applications ordered by (created_at, id), starting after `after`."""
+    query = db.query(Application).options(joinedload(Application.job))
+    if user_id:
+        query = query.filter(Application.user_id == user_id)
+    if after:
+        query = query.filter(keyset_after(Application, after))
+    return query.order_by(Application.created_at, Application.id).limit(limit).all()
+
 def get_application(db: Session, application_id: int):
-    return db.query(Application).filter(Application.id == application_id).first()
+    return db.query(Application).options(joinedload(Application.job)).filter(
+        Application.id == application_id
+    ).first()
+
+def _acquire_resume_blob(db: Session, sha256: str, size: Optional[int]):
+    # Atomic upsert: register the blob or add a reference to it
+    insert = postgresql.insert if is_postgres(db.get_bind()) else sqlite.insert
+    db.execute(
+        insert(ResumeBlob)
+        .values(sha256=sha256, size=size, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[ResumeBlob.sha256],
+            set_={"ref_count": ResumeBlob.ref_count + 1}
+        )
+    )
+
+def _register_resume_text(db: Session, sha256: str):
+    # First application with this file queues its text extraction
+    insert = postgresql.insert if is_postgres(db.get_bind()) else sqlite.insert
+    db.execute(
+        insert(ResumeText)
+        .values(sha256=sha256, status="pending")
+        .on_conflict_do_nothing(index_elements=[ResumeText.sha256])
+    )
+
+def create_application(db: Session, application: ApplicationCreate, user_id: int, resume_url: str,
+                       resume_sha256: Optional[str] = None, resume_size: Optional[int] = None):
+    """Raises LookupError if the job does not exist and ValueError if the user already applied."""
+    if db.query(Job.id).filter(Job.id == application.job_id).first() is None:
+        raise LookupError("Job not found")
 
-def create_application(db: Session, application: ApplicationCreate, user_id: int, resume_url: str):
     # Check if user already applied for this job
     existing_application = db.query(Application).filter(
         and_(Application.user_id == user_id, Application.job_id == application.job_id)
@@ -102,25 +350,272 @@ def create_application(db: Session, application: ApplicationCreate, user_id: int
     db_application = Application(
         **application.dict(),
         user_id=user_id,
-        resume_url=resume_url
+        resume_url=resume_url,
+        resume_sha256=resume_sha256
     )
     db.add(db_application)
-    db.commit()
+    try:
+        # Flushed first so the applicant counters see the default status
+        db.flush()
+        db.query(Job).filter(Job.id == application.job_id).update(
+            # updated_at stays: applying does not change the job itself
+            {Job.application_count: Job.application_count + 1, Job.updated_at: Job.updated_at},
+            synchronize_session=False
+        )
+        facets.apply_application_deltas(db, Counter({(db_application.job_id, db_application.status): 1}))
+        if resume_sha256:
+            _acquire_resume_blob(db, resume_sha256, resume_size)
+            _register_resume_text(db, resume_sha256)
+        # The job's applicant count changes too
+        facets.bump_versions(db, "jobs", "applications")
+        db.commit()
+        # Job responses embed the applicant count
+        _jobs_changed()
+    except IntegrityError:
+        db.rollback()
+        # The job was deleted meanwhile (foreign key), or we lost a race with
+        # a concurrent duplicate application
+        if db.query(Job.id).filter(Job.id == application.job_id).first() is None:
+            raise LookupError("Job not found")
+        raise ValueError("User has already applied for this job")
     db.refresh(db_application)
     return db_application
 
 def update_application(db: Session, application_id: int, application: ApplicationUpdate):
-    db_application = get_application(db, application_id)
+    # Row lock so concurrent status changes move the applicant counters consistently
+    db_application = db.query(Application).filter(Application.id == application_id).with_for_update().first()
     if not db_application:
         return None
     
+    old_status = db_application.status
     update_data = application.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_application, field, value)
     
+    counters_changed = db_application.status != old_status and db_application.job_id is not None
+    if counters_changed:
+        deltas = Counter({(db_application.job_id, db_application.status): 1})
+        if old_status is not None:
+            deltas[(db_application.job_id, old_status)] -= 1
+        facets.apply_application_deltas(db, deltas)
+    facets.bump_versions(db, "applications")
     db.commit()
+    if counters_changed:
+        _jobs_changed()
     db.refresh(db_application)
     return db_application
 
-def get_applications_by_job(db: Session, job_id: int):
-    return db.query(Application).filter(Application.job_id == job_id).all() 
\ No newline at end of file
+def update_applications_bulk(db: Session, change: ApplicationBulkUpdate, batch_size: int = 1000) -> dict:
+    """Set the status of many applications in one transaction.
+
+    Selects either `change.ids` or a job's applications, in both cases only
+    changing those in `change.current_status` if given. Returns counts and a
+    result per id; selected applications left as they are count as unchanged.
+    """
+    query = select(Application.id, Application.job_id, Application.status)
+    if change.ids is not None:
+        ids = list(dict.fromkeys(change.ids))
+        query = query.where(Application.id.in_(ids))
+    else:
+        query = query.where(Application.job_id == change.job_id)
+        if change.current_status:
+            query = query.where(Application.status == change.current_status)
+    # Row locks keep the counter deltas exact under concurrent reviews
+    rows = db.execute(query.order_by(Application.id).with_for_update()).all()
+    if change.ids is None:
+        ids = [row.id for row in rows]
+
+    # With ids, rows in another status than current_status are left alone
+    changed = [
+        row for row in rows
+        if row.status != change.status and change.current_status in (None, row.status)
+    ]
+    # Bounded IN lists; every batch is a single UPDATE in the same transaction
+    for start in range(0, len(changed), batch_size):
+        db.execute(
+            update(Application)
+            .where(Application.id.in_([row.id for row in changed[start:start + batch_size]]))
+            .values(status=change.status, updated_at=func.now())
+        )
+    deltas = Counter()
+    for row in changed:
+        if row.job_id is not None:
+            deltas[(row.job_id, change.status)] += 1
+            if row.status is not None:
+                deltas[(row.job_id, row.status)] -= 1
+    facets.apply_application_deltas(db, deltas)
+    if changed:
+        facets.bump_versions(db, "applications")
+    db.commit()
+    if deltas:
+        _jobs_changed()
+
+    changed_ids = {row.id for row in changed}
+    found_ids = {row.id for row in rows}
+    items = [
+        {"id": application_id,
+         "result": "updated" if application_id in changed_ids
+         else "unchanged" if application_id in found_ids else "not_found"}
+        for application_id in ids
+    ]
+    return {
+        "updated": len(changed_ids),
+        "unchanged": len(found_ids) - len(changed_ids),
+        "not_found": len(ids) - len(found_ids),
+        "items": items,
+    }
+
+def _applications_for_job(db: Session, job_id: int, status: Optional[str] = None, q: Optional[str] = None):
+    query = db.query(Application).filter(Application.job_id == job_id)
+    if status:
+        query = query.filter(Application.status == status)
+    if q:
+        # Resumes whose text has not been extracted yet never match
+        match = search.resume_match(db, q)
+        query = query.filter(match if match is not None else false())
+    return query
+
+def get_applications_by_job(db: Session, job_id: int, skip: int = 0, limit: int = 100,
+                            status: Optional[str] = None, q: Optional[str] = None):
+    query = _applications_for_job(db, job_id, status, q)
+    return query.order_by(Application.created_at, Application.id).offset(skip).limit(limit).all()
+
+def get_applications_by_job_after(db: Session, job_id: int, after: Optional[Tuple[datetime, int]] = None,
+                                  limit: int = 100, status: Optional[str] = None, q: Optional[str] = None):
+    """Keyset page of a job's applications ordered by (created_at, id)."""
+    query = _applications_for_job(db, job_id, status, q)
+    if after:
+        query = query.filter(keyset_after(Application, after))
+    return query.order_by(Application.created_at, Application.id).limit(limit).all()
+
+# Dashboard statistics, read from the maintained counters
+def get_job_application_stats(db: Session, job_id: int):
+    application_count = db.query(Job.application_count).filter(Job.id == job_id).scalar()
+    if application_count is None:
+        return None
+    by_status = dict(
+        db.query(JobApplicationCount.status, JobApplicationCount.count)
+        .filter(JobApplicationCount.job_id == job_id, JobApplicationCount.count > 0)
+        .all()
+    )
+    return {"job_id": job_id, "application_count": application_count, "by_status": by_status}
+
+def get_admin_stats(db: Session, top_jobs: int = 10):
+    jobs_by_status = dict(
+        db.query(JobFacet.value, JobFacet.count)
+        .filter(JobFacet.facet == "status", JobFacet.count > 0)
+        .all()
+    )
+    applications_by_status = dict(
+        db.query(JobApplicationCount.status, func.sum(JobApplicationCount.count))
+        .group_by(JobApplicationCount.status)
+        .having(func.sum(JobApplicationCount.count) > 0)
+        .all()
+    )
+    # Range scans over ix_applications_created_at_id
+    now = datetime.now(timezone.utc)
+    recent = {
+        f"applications_last_{label}": db.query(func.count(Application.id))
+        .filter(Application.created_at >= now - delta)
+        .scalar()
+        for label, delta in (("24h", timedelta(days=1)), ("7d", timedelta(days=7)))
+    }
+    top = (
+        db.query(Job.id, Job.title, Job.application_count)
+        .order_by(Job.application_count.desc(), Job.id)
+        .limit(top_jobs)
+        .all()
+    )
+    return {
+        "jobs": sum(jobs_by_status.values()),
+        "jobs_by_status": jobs_by_status,
+        "applications": sum(applications_by_status.values()),
+        "applications_by_status": applications_by_status,
+        **recent,
+        "top_jobs": [row._asdict() for row in top],
+    }
+
+# Async counterparts
+# Each runs the sync function above on the request session through run_db, so
+# async routes work with both Session and AsyncSession (DATABASE_ASYNC).
+async def get_user_by_email_async(db, email: str):
+    return await run_db(db, get_user_by_email, email)
+
+async def create_user_async(db, user: UserCreate, hashed_password: Optional[str] = None):
+    return await run_db(db, create_user, user, hashed_password)
+
+async def get_jobs_async(db, **filters):
+    return await run_db(db, get_jobs, **filters)
+
+async def get_jobs_after_async(db, **filters):
+    return await run_db(db, get_jobs_after, **filters)
+
+async def get_job_summaries_async(db, **filters):
+    return await run_db(db, get_job_summaries, **filters)
+
+async def get_job_summaries_after_async(db, **filters):
+    return await run_db(db, get_job_summaries_after, **filters)
+
+async def search_jobs_async(db, q: str, **filters):
+    return await run_db(db, search_jobs, q, **filters)
+
+async def get_job_facets_async(db):
+    return await run_db(db, get_job_facets)
+
+async def get_jobs_version_async(db):
+    return await run_db(db, get_jobs_version)
+
+async def get_applications_version_async(db):
+    return await run_db(db, get_applications_version)
+
+async def get_job_async(db, job_id: int):
+    return await run_db(db, get_job, job_id)
+
+async def create_job_async(db, job: JobCreate):
+    return await run_db(db, create_job, job)
+
+async def update_job_async(db, job_id: int, job: JobUpdate):
+    return await run_db(db, update_job, job_id, job)
+
+async def delete_job_async(db, job_id: int):
+    return await run_db(db, delete_job, job_id)
+
+async def upsert_jobs_async(db, jobs: List[dict]):
+    return await run_db(db, upsert_jobs, jobs)
+
+async def get_similar_jobs_async(db, job_id: int, limit: int = 10):
+    return await run_db(db, get_similar_jobs, job_id, limit)
+
+async def get_recommended_jobs_async(db, user_id: int, limit: int = 10):
+    return await run_db(db, get_recommended_jobs, user_id, limit)
+
+async def get_applications_async(db, **filters):
+    return await run_db(db, get_applications, **filters)
+
+async def get_applications_after_async(db, **filters):
+    return await run_db(db, get_applications_after, **filters)
+
+async def get_application_async(db, application_id: int):
+    return await run_db(db, get_application, application_id)
+
+async def create_application_async(db, application: ApplicationCreate, user_id: int, resume_url: str,
+                                   resume_sha256: Optional[str] = None, resume_size: Optional[int] = None):
+    return await run_db(db, create_application, application, user_id, resume_url, resume_sha256, resume_size)
+
+async def update_application_async(db, application_id: int, application: ApplicationUpdate):
+    return await run_db(db, update_application, application_id, application)
+
+async def update_applications_bulk_async(db, change: ApplicationBulkUpdate, batch_size: int = 1000):
+    return await run_db(db, update_applications_bulk, change, batch_size)
+
+async def get_applications_by_job_async(db, job_id: int, **filters):
+    return await run_db(db, get_applications_by_job, job_id, **filters)
+
+async def get_applications_by_job_after_async(db, job_id: int, **filters):
+    return await run_db(db, get_applications_by_job_after, job_id, **filters)
+
+async def get_job_application_stats_async(db, job_id: int):
+    return await run_db(db, get_job_application_stats, job_id)
+
+async def get_admin_stats_async(db):
+    return await run_db(db, get_admin_stats)
@@ -1,32 +1,251 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 from config import settings
 
-# Create engine based on database URL
-if settings.DATABASE_URL.startswith("postgresql"):
-    # PostgreSQL configuration
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        pool_size=10,
-        max_overflow=20
-    )
-else:
-    # SQLite configuration (for development)
-    engine = create_engine(
-        settings.DATABASE_URL, 
-        connect_args={"check_same_thread": False}
-    )
+logger = logging.getLogger(__name__)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Clients that just wrote carry this cookie (an epoch deadline) so their
+# reads stay on the primary whichever API process serves them
+PRIMARY_COOKIE = "read_primary_until"
 
-Base = declarative_base()
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+# Connections each pooled sync engine can hand out. In sync mode a session
+# only takes a threadpool thread once it holds one of these slots: otherwise,
+# under load, every thread can end up blocked on checkout while the sessions
+# holding the connections wait for a thread to run their next query.
+_connection_slots = {}
+
+def _create_engines(url: str):
+    """Sync engine for `url`, plus an async engine when DATABASE_ASYNC is set."""
+    if url.startswith("postgresql"):
+        # PostgreSQL configuration
+        engine_options = dict(pool_options)
+        connect_args = {}
+        async_connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+            async_connect_args = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        sync_engine = create_engine(url, connect_args=connect_args, **engine_options)
+        async_engine_options = engine_options
+        async_driver = "postgresql+asyncpg"
+    else:
+        # SQLite configuration (for development)
+        # In-memory databases get a single-connection pool that takes no sizing
+        in_memory = make_url(url).database in (None, "", ":memory:")
+        engine_options = {} if in_memory else dict(pool_options)
+        sync_engine = create_engine(
+            url, 
+            connect_args={"check_same_thread": False},
+            **engine_options
+        )
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+        async_connect_args = {}
+        # aiosqlite opens a connection per checkout (NullPool), so no sizing either
+        async_engine_options = {}
+        async_driver = "sqlite+aiosqlite"
+
+    if engine_options and settings.DB_MAX_OVERFLOW >= 0:
+        _connection_slots[sync_engine] = asyncio.Semaphore(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+    # Async engine for request handling (DATABASE_ASYNC=true). Migrations and
+    # the command line scripts always use the sync engine.
+    async_engine = None
+    if settings.DATABASE_ASYNC:
+        async_engine = create_async_engine(
+            make_url(url).set(drivername=async_driver),
+            connect_args=async_connect_args,
+            **async_engine_options
+        )
+        if async_driver == "sqlite+aiosqlite":
+            event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return sync_engine, async_engine
+
+def _session_factories(sync_engine, async_engine):
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    async_session_factory = None
+    if async_engine is not None:
+        async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return session_factory, async_session_factory
+
+engine, async_engine = _create_engines(settings.DATABASE_URL)
+SessionLocal, AsyncSessionLocal = _session_factories(engine, async_engine)
+
+class Replica:
+    """A read replica: its engines, session factories and health state."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine, self.async_engine = _create_engines(url)
+        self.session_factory, self.async_session_factory = _session_factories(self.engine, self.async_engine)
+        self.ejected_until = 0.0
+        event.listen(self.engine, "handle_error", self._handle_error)
+        if self.async_engine is not None:
+            event.listen(self.async_engine.sync_engine, "handle_error", self._handle_error)
+
+    def _handle_error(self, context):
+        # Lost or refused connections take the replica out of rotation; query
+        # errors such as statement timeouts do not
+        if context.is_disconnect or context.connection is None:
+            self.eject()
+
+    def eject(self):
+        if self.healthy:
+            logger.warning("Ejecting read replica %s for %ss", self.name, settings.REPLICA_EJECT_SECONDS)
+        self.ejected_until = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+class ReplicaRouter:
+    """Chooses where read-only sessions go.
+
+    Replicas are used round-robin, skipping ejected ones; reads fall back to
+    the primary when there are no healthy replicas or while a recent write
+    may not have replicated yet.
+    """
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._next = itertools.count()
+        self.primary_until = 0.0
+
+    def stick_to_primary(self):
+        """Route this process's reads, and the current client's, to the primary for a while."""
+        self.primary_until = time.monotonic() + settings.REPLICA_STICKY_SECONDS
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.primary_until = time.time() + settings.REPLICA_STICKY_SECONDS
+
+    def pick(self, primary_until: float = 0.0) -> Optional[Replica]:
+        """Next healthy replica, or None to read from the primary.
 
-def get_db():
-    db = SessionLocal()
+        `primary_until` is the client's own stickiness deadline (epoch seconds).
+        """
+        if not self.replicas or time.monotonic() < self.primary_until or time.time() < primary_until:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def read_engine(self):
+        """Sync engine for a read-only job outside a request, such as an export."""
+        replica = self.pick()
+        return replica.engine if replica else engine
+
+class RequestWrites:
+    def __init__(self):
+        self.primary_until = None
+
+_request_writes: ContextVar[Optional[RequestWrites]] = ContextVar("request_writes", default=None)
+
+@contextmanager
+def track_writes():
+    """Record whether the code in this context wrote through ReplicaRouter.stick_to_primary()."""
+    writes = RequestWrites()
+    token = _request_writes.set(writes)
     try:
-        yield db
+        yield writes
     finally:
-        db.close() 
\ No newline at end of file
+        _request_writes.reset(token)
+
+replicas = ReplicaRouter([
+    Replica(f"replica{i}", url)
+    for i, url in enumerate(filter(None, (url.strip() for url in settings.DATABASE_REPLICA_URLS.split(","))))
+])
+
+Base = declarative_base()
+
+def is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+def _client_primary_until(request: Request) -> float:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+if settings.DATABASE_ASYNC:
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    async def get_read_db(request: Request):
+        """Session for read-only endpoints, on a replica when one is available."""
+        replica = replicas.pick(_client_primary_until(request))
+        async with (replica.async_session_factory if replica else AsyncSessionLocal)() as db:
+            yield db
+else:
+    async def _close(db):
+        try:
+            await run_in_threadpool(db.close)
+        finally:
+            slots = db.info.pop("connection_slot", None)
+            if slots is not None:
+                slots.release()
+
+    async def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await _close(db)
+
+    async def get_read_db(request: Request):
+        """Session for read-only endpoints, on a replica when one is available."""
+        replica = replicas.pick(_client_primary_until(request))
+        db = (replica.session_factory if replica else SessionLocal)()
+        try:
+            yield db
+        finally:
+            await _close(db)
+
+async def _take_connection_slot(db):
+    # Held from the session's first query until get_db closes it
+    slots = _connection_slots.get(db.get_bind())
+    if slots is not None and "connection_slot" not in db.info:
+        await slots.acquire()
+        db.info["connection_slot"] = slots
+
+async def run_db(db, fn, *args, **kwargs):
+    """Run sync ORM code on a request session without blocking the event loop.
+
+    With an AsyncSession the function runs through `run_sync` on the async
+    driver; with a plain Session it runs in the threadpool, once the session
+    is sure to get a connection.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+    await _take_connection_slot(db)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,152 @@
+from collections import Counter
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from config import settings
+from database import is_postgres
+from models import Application, ChangeVersion, Job, JobApplicationCount, JobFacet
+
+# Incrementally maintained job facets and applicant counters.
+# job_facets keeps one counter per (facet, value): jobs per status, per
+# location and per salary bucket. job_application_counts keeps one counter per
+# (job, application status). crud applies +1/-1 deltas in the same
+# transaction as every write, so GET /jobs/facets and the admin stats read a
+# few small rows instead of grouping the jobs and applications tables.
+# reconcile() rebuilds all counters, including jobs.application_count, from
+# the base tables; run it periodically (`python facets.py`) to repair drift.
+# change_versions counts the writes to jobs and to applications: every write
+# transaction bumps it, so the ETag version tokens built from it change with
+# every commit, whatever its timestamps.
+
+FACETS = ("status", "location", "salary")
+VERSIONS = ("jobs", "applications")
+
+FacetKey = Tuple[str, str]
+
+def salary_bucket(salary) -> Optional[str]:
+    if salary is None:
+        return None
+    size = settings.FACET_SALARY_BUCKET_SIZE
+    return str(int(salary // size * size))
+
+def facet_keys(status, location, salary) -> List[FacetKey]:
+    keys = [("status", status), ("location", location), ("salary", salary_bucket(salary))]
+    return [(facet, value) for facet, value in keys if value is not None]
+
+def job_facet_keys(job) -> List[FacetKey]:
+    return facet_keys(job.status, job.location, job.salary)
+
+def _upsert_counts(db, model, key_columns, deltas: Counter):
+    # Sorted so concurrent writers lock counter rows in the same order
+    names = [column.key for column in key_columns]
+    rows = [
+        {**dict(zip(names, key)), "count": count}
+        for key, count in sorted(deltas.items())
+        if count
+    ]
+    if not rows:
+        return
+    dialect_insert = postgresql.insert if is_postgres(db.get_bind()) else sqlite.insert
+    stmt = dialect_insert(model)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={"count": model.count + stmt.excluded["count"]}
+        ),
+        rows
+    )
+
+def apply_deltas(db, deltas: Counter):
+    """Add `deltas`, keyed by (facet, value), to the job facet counters in one executemany upsert."""
+    _upsert_counts(db, JobFacet, [JobFacet.facet, JobFacet.value], deltas)
+
+def apply_application_deltas(db, deltas: Counter):
+    """Add `deltas`, keyed by (job_id, status), to the applicant counters."""
+    _upsert_counts(db, JobApplicationCount, [JobApplicationCount.job_id, JobApplicationCount.status], deltas)
+
+def get_facets(db) -> dict:
+    size = settings.FACET_SALARY_BUCKET_SIZE
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in db.execute(
+        select(JobFacet.facet, JobFacet.value, JobFacet.count).where(JobFacet.count > 0)
+    ):
+        if facet == "salary":
+            facets[facet].append({"min": float(value), "max": float(value) + size, "count": count})
+        elif facet in facets:
+            facets[facet].append({"value": value, "count": count})
+    facets["status"].sort(key=lambda item: (-item["count"], item["value"]))
+    facets["location"].sort(key=lambda item: (-item["count"], item["value"]))
+    facets["salary"].sort(key=lambda item: item["min"])
+    return facets
+
+def bump_versions(db, *names: str):
+    """Advance the change counters in `names` within the caller's transaction.
+
+    Call once per transaction, just before committing: the counter rows stay
+    locked until then.
+    """
+    db.execute(
+        update(ChangeVersion)
+        .where(ChangeVersion.name.in_(sorted(set(names))))
+        .values(version=ChangeVersion.version + 1)
+    )
+
+def get_versions(db) -> dict:
+    return dict(db.execute(select(ChangeVersion.name, ChangeVersion.version)).all())
+
+def reconcile(db) -> dict:
+    """Recount every facet and per-job applicant count from the base tables.
+
+    Returns the number of facet values and of jobs whose applicant count was
+    corrected. The caller commits.
+    """
+    if is_postgres(db.get_bind()):
+        # Writers block on their counter update until this transaction commits
+        # and then apply their delta on top of the fresh counts
+        db.execute(text("LOCK TABLE job_facets, job_application_counts IN EXCLUSIVE MODE"))
+    db.execute(delete(JobFacet))
+    db.execute(delete(JobApplicationCount))
+
+    counts = Counter()
+    # Scanned in Python so buckets match salary_bucket() on every database
+    for status, location, salary in db.execute(
+        select(Job.status, Job.location, Job.salary).execution_options(yield_per=1000)
+    ):
+        counts.update(facet_keys(status, location, salary))
+    if counts:
+        db.execute(
+            insert(JobFacet),
+            [{"facet": facet, "value": value, "count": count} for (facet, value), count in counts.items()]
+        )
+
+    db.execute(
+        insert(JobApplicationCount).from_select(
+            ["job_id", "status", "count"],
+            select(Application.job_id, Application.status, func.count())
+            .where(Application.job_id.isnot(None), Application.status.isnot(None))
+            .group_by(Application.job_id, Application.status)
+        )
+    )
+    applicants = select(func.count()).where(Application.job_id == Job.id).scalar_subquery()
+    # Only jobs whose count drifted; keeping updated_at (and so the jobs'
+    # change times other processes sync from) as it is
+    jobs = db.execute(
+        update(Job)
+        .where(Job.application_count != applicants)
+        .values(application_count=applicants, updated_at=Job.updated_at),
+        execution_options={"synchronize_session": False}
+    ).rowcount
+    return {"facets": len(counts), "jobs": jobs}
+
+if __name__ == "__main__":
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        result = reconcile(db)
+        if result["jobs"]:
+            # Corrected applicant counts are part of the job responses
+            bump_versions(db, "jobs")
+        print(result)
+        db.commit()
+    finally:
+        db.close()
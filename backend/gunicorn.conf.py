@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from config import settings
+
+# Production process model: `gunicorn -c gunicorn.conf.py main:app`.
+# The master imports the app once (preload) and migrates the database, then
+# forks Uvicorn workers, one per available CPU unless WEB_CONCURRENCY says
+# otherwise. Crashed workers are replaced; SIGHUP replaces all workers
+# gracefully (e.g. after a config change), and SIGTERM lets in-flight requests
+# finish for GRACEFUL_TIMEOUT_SECONDS before exiting.
+
+def _available_cpus() -> int:
+    # Respects container CPU sets, unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY or _available_cpus()
+if workers > 1 and "CACHE_BACKEND" not in os.environ:
+    # A memory cache is per worker and a write only invalidates the worker
+    # that handled it, so several workers share the cache through Redis.
+    # Must be decided before the app (and its cache) is imported
+    settings.CACHE_BACKEND = "redis"
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = settings.GRACEFUL_TIMEOUT_SECONDS
+timeout = 60
+keepalive = 5
+# Recycle workers now and then; jitter keeps them from restarting together
+max_requests = settings.MAX_REQUESTS
+max_requests_jitter = settings.MAX_REQUESTS // 10
+accesslog = "-"
+
+if settings.METRICS_ENABLED:
+    # Workers write request metrics to shared files that /metrics sums up.
+    # Must be set before prometheus_client is imported, i.e. before the app
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "job_board_metrics"))
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+def on_starting(server):
+    if server.cfg.workers > 1 and settings.CACHE_BACKEND == "memory":
+        # Also catches --workers on the command line, which this file cannot see
+        raise RuntimeError(
+            f"CACHE_BACKEND=memory serves stale job responses with {server.cfg.workers} workers; "
+            "use CACHE_BACKEND=redis (or none), or WEB_CONCURRENCY=1"
+        )
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Drop the previous run's figures (this hook does not run on SIGHUP)
+        multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir)
+    if settings.MIGRATE_ON_STARTUP:
+        from database import engine
+        from migrations import migrate
+        applied = migrate(engine)
+        server.log.info("Applied migrations: %s", applied or "none")
+        # Workers must not inherit the master's pooled connections
+        engine.dispose()
+        # Migrated once here, so workers skip it in their lifespan
+        settings.MIGRATE_ON_STARTUP = False
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
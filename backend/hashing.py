@@ -0,0 +1,99 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from config import settings
+
+# Password hashing off the event loop.
+# bcrypt is deliberately slow, so hashes run on a dedicated executor whose size
+# caps how many run at once. Requests beyond `max_pending` are rejected with
+# HashingBusy instead of queueing up behind a login storm.
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+class HashingBusy(Exception):
+    """Raised when the hashing executor is saturated."""
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+def _timed(fn, *args):
+    # Wall-clock timestamps, since process workers don't share perf_counter
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+class PasswordHasher:
+    def __init__(self, workers: int = 4, max_pending: int = 64, use_processes: bool = False):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.hash_seconds = 0.0
+        self._executor = None
+
+    def _get_executor(self):
+        # Created lazily so importing the app never forks worker processes
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HashingBusy()
+        self.in_flight += 1
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+            self.wait_seconds += max(0.0, started - submitted)
+            self.hash_seconds += finished - started
+            return result
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash when the stored one uses outdated parameters."""
+        return await self._run(_verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "hash_seconds": round(self.hash_seconds, 3),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_EXECUTOR == "process"
+)
@@ -0,0 +1,77 @@
+import asyncio
+import math
+import time
+from typing import Optional, Tuple
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+from config import settings
+from database import engine, async_engine, is_postgres
+
+# Liveness and readiness checks for load balancers.
+# A replica is ready when its connection pools have headroom and the database
+# answers a trivial query within HEALTH_MAX_DB_LATENCY_MS; otherwise
+# /health/ready returns 503 so traffic is routed elsewhere until it recovers.
+
+def pool_usage(bind) -> Optional[float]:
+    """Fraction of the pool's maximum connections checked out, or None for unsized pools."""
+    pool = bind.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return pool.checkedout() / (pool.size() + settings.DB_MAX_OVERFLOW)
+
+def _create_ping_engine():
+    # A ping abandoned by wait_for() keeps its thread until it returns, so in
+    # sync mode it runs on a one-connection engine of its own whose checkout,
+    # connect and statement all give up after about HEALTH_MAX_DB_LATENCY_MS
+    # rather than after DB_POOL_TIMEOUT. Pool saturation is checked separately.
+    if not isinstance(engine.pool, QueuePool):
+        return engine
+    timeout_ms = settings.HEALTH_MAX_DB_LATENCY_MS
+    if is_postgres(engine):
+        # libpq's connect_timeout is in whole seconds, at least 2
+        connect_args = {
+            "connect_timeout": max(2, math.ceil(timeout_ms / 1000)),
+            "options": f"-c statement_timeout={int(timeout_ms)}",
+        }
+    else:
+        connect_args = {"check_same_thread": False, "timeout": timeout_ms / 1000}
+    return create_engine(
+        engine.url, pool_size=1, max_overflow=0, pool_timeout=timeout_ms / 1000,
+        pool_pre_ping=False, connect_args=connect_args
+    )
+
+ping_engine = _create_ping_engine() if async_engine is None else None
+
+def _ping():
+    with ping_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+async def _ping_async():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def _check_database() -> dict:
+    timeout = settings.HEALTH_MAX_DB_LATENCY_MS / 1000
+    started = time.perf_counter()
+    try:
+        # Ping through the engine that serves requests
+        ping = _ping_async() if async_engine is not None else run_in_threadpool(_ping)
+        await asyncio.wait_for(ping, timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"no response within {settings.HEALTH_MAX_DB_LATENCY_MS:g} ms"}
+    except Exception as e:
+        return {"ok": False, "error": type(e).__name__}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+async def check_readiness() -> Tuple[bool, dict]:
+    checks = {}
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    for name, bind in engines.items():
+        usage = pool_usage(bind)
+        if usage is not None:
+            checks[f"pool_{name}"] = {"ok": usage < settings.HEALTH_POOL_SATURATION, "usage": round(usage, 3)}
+    checks["database"] = await _check_database()
+    return all(check["ok"] for check in checks.values()), checks
@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from fastapi import Request, Response
+
+# HTTP caching validators (ETag / Last-Modified) and conditional GET handling.
+
+def http_date(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        # SQLite hands back naive timestamps, which are stored in UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+def weak_etag(*parts) -> str:
+    """Weak ETag for a representation identified by `parts`, e.g. request parameters and a data version."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == target for tag in if_none_match.split(","))
+
+def is_not_modified(request: Request, etag: Optional[str] = None,
+                    last_modified: Optional[datetime] = None) -> bool:
+    """Whether the client's cached copy is current. If-None-Match takes precedence."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+def if_range_matches(request: Request, etag: Optional[str] = None,
+                     last_modified: Optional[datetime] = None) -> bool:
+    """Whether a Range request may be served partially (RFC 9110 13.1.5).
+
+    If-Range must strongly match the ETag or exactly equal Last-Modified;
+    otherwise the whole representation is sent.
+    """
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return etag is not None and not etag.startswith("W/") and if_range == etag
+    return last_modified is not None and if_range == http_date(last_modified)
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) of a single `Range: bytes=...` request on `size` bytes.
+
+    Returns None when the header should be ignored (other units, malformed or
+    multiple ranges), so the whole representation is served. Raises
+    ValueError when the range cannot be satisfied (416).
+    """
+    unit, _, spec = range_header.partition("=")
+    first, sep, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not sep or "," in spec:
+        return None
+    first, last = first.strip(), last.strip()
+    if not first:
+        # Suffix range: the last `last` bytes
+        if not last.isdigit():
+            return None
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(range_header)
+        return max(size - length, 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(range_header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine
-from models import Base, User
+from models import User
 from auth import get_password_hash
+from migrations import migrate
 
 def init_db():
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Create tables and indexes
+    migrate(engine)
     
     db = SessionLocal()
     
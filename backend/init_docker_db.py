@@ -2,8 +2,8 @@ import os
 import time
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
-from models import Base
 from auth import get_password_hash
+from migrations import migrate
 
 def wait_for_database(database_url, max_retries=30):
     """Wait for database to be ready"""
@@ -28,9 +28,10 @@ def init_docker_db():
     # Wait for database to be ready
     engine = wait_for_database(database_url)
     
-    # Create tables
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Apply schema migrations
+    print("Applying database migrations...")
+    applied = migrate(engine)
+    print(f"Applied migrations: {applied}" if applied else "Database schema is up to date")
     
     # Create admin user if it doesn't exist
     from sqlalchemy.orm import sessionmaker
@@ -1,40 +1,93 @@
+import time
+from contextlib import asynccontextmanager
 from typing import Union
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 import os
-from database import engine
-from models import Base
-from routers import auth, jobs, applications
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Job Board API",
-    description="A comprehensive job board application with admin and user interfaces",
-    version="1.0.0"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your frontend domain
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files for resume uploads
-if os.path.exists("uploads"):
-    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-# Include routers
-app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
-app.include_router(applications.router, prefix="/applications", tags=["Applications"])
-
-@app.get("/")
+from config import settings
+from compression import CompressionMiddleware
+from database import PRIMARY_COOKIE, SessionLocal, engine, async_engine, replicas, track_writes
+from migrations import migrate
+from sqlstats import count_queries, track_queries
+from uploads import FORM_OVERHEAD_BYTES, UploadBodyLimit
+from hashing import password_hasher
+from health import check_readiness
+from recommendations import job_index
+from resumetext import resume_indexer
+import metrics
+from routers import auth, jobs, applications, admin
+
+# Application factory.
+# Importing this module only builds the app; database and filesystem work
+# happens in the lifespan, once per worker process, so `gunicorn --preload`
+# can import the app in the master and fork workers cheaply.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.MIGRATE_ON_STARTUP:
+        # Bring the database schema up to date
+        await run_in_threadpool(migrate, engine)
+    if settings.STORAGE_BACKEND == "local":
+        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    # Load the similar-jobs snapshot, or build the index off the request path
+    index_path = settings.SIMILAR_JOBS_INDEX_PATH
+    if not (index_path and await run_in_threadpool(job_index.load, index_path)):
+        job_index.build_in_background(SessionLocal, index_path)
+    yield
+    await resume_indexer.aclose()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replicas.replicas:
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
+        replica.engine.dispose()
+    engine.dispose()
+
+async def instrument_requests(request: Request, call_next):
+    started = time.perf_counter()
+    with count_queries() as stats:
+        response = await call_next(request)
+    # Streaming bodies are still being sent; this covers the time to headers
+    duration = time.perf_counter() - started
+    if settings.METRICS_ENABLED:
+        metrics.observe_request(request.method, metrics.route_label(request), response.status_code,
+                                duration, stats)
+    if settings.SERVER_TIMING_HEADERS:
+        response.headers["Server-Timing"] = metrics.server_timing(duration, stats)
+    if settings.SQL_DEBUG_HEADERS:
+        response.headers["X-SQL-Query-Count"] = str(stats.count)
+        response.headers["X-SQL-Query-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+    return response
+
+async def stick_writers_to_primary(request: Request, call_next):
+    # Clients that wrote keep reading from the primary until their
+    # write has reached the replicas
+    with track_writes() as writes:
+        response = await call_next(request)
+    if writes.primary_until is not None:
+        response.set_cookie(
+            PRIMARY_COOKIE, f"{writes.primary_until:.3f}",
+            max_age=max(1, int(settings.REPLICA_STICKY_SECONDS)), httponly=True, samesite="lax"
+        )
+    return response
+
+def _instrumented_engines() -> dict:
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    for replica in replicas.replicas:
+        engines[replica.name] = replica.engine
+        if replica.async_engine is not None:
+            engines[f"{replica.name}_async"] = replica.async_engine.sync_engine
+    return engines
+
+router = APIRouter()
+
+@router.get("/")
 def read_root():
     return {
         "message": "Job Board API",
@@ -43,11 +96,97 @@ def read_root():
         "redoc": "/redoc"
     }
 
-@app.get("/health")
+@router.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "password_hashing": password_hasher.stats(),
+        "resume_text": resume_indexer.stats(),
+    }
+
+@router.get("/health/live")
+def liveness_check():
+    """The process is up and serving requests"""
+    return {"status": "alive"}
 
-@app.get("/job/{job_id}")
+@router.get("/health/ready")
+async def readiness_check():
+    """Database reachable within the latency budget and connection pools not saturated"""
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "unavailable", "checks": checks}
+    )
+
+def read_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+@router.get("/job/{job_id}")
 def read_job_id(job_id: int, q: Union[str, None] = None):
     return {"job_id": job_id, "q": q}
 
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Job Board API",
+        description="A comprehensive job board application with admin and user interfaces",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify your frontend domain
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Negotiated brotli/gzip compression of JSON, NDJSON and CSV responses
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    # Resume uploads: refuse oversized bodies before the multipart form is parsed
+    app.add_middleware(
+        UploadBodyLimit,
+        max_bytes=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024 + FORM_OVERHEAD_BYTES,
+        paths=["/applications/"]
+    )
+
+    # Request instrumentation: Prometheus metrics, Server-Timing and SQL debug headers
+    engines = _instrumented_engines()
+    for tracked_engine in engines.values():
+        track_queries(
+            tracked_engine,
+            slow_query_ms=settings.SLOW_QUERY_MS,
+            observe=metrics.observe_query if settings.METRICS_ENABLED else None
+        )
+    if settings.METRICS_ENABLED:
+        metrics.register_collectors(engines, password_hasher)
+        metrics.time_checkouts(engines)
+    if settings.METRICS_ENABLED or settings.SERVER_TIMING_HEADERS or settings.SQL_DEBUG_HEADERS:
+        app.middleware("http")(instrument_requests)
+
+    if replicas.replicas:
+        app.middleware("http")(stick_writers_to_primary)
+
+    # Mount static files for resume uploads
+    if os.path.exists("uploads"):
+        app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+    # Include routers
+    app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
+    app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+    app.include_router(applications.router, prefix="/applications", tags=["Applications"])
+    app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+    app.include_router(router)
+    if settings.METRICS_ENABLED:
+        app.add_api_route("/metrics", read_metrics, include_in_schema=False)
+    return app
+
+app = create_app()
@@ -0,0 +1,151 @@
+import os
+import time
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, SummaryMetricFamily
+from sqlstats import QueryStats
+
+# Prometheus metrics.
+# Request metrics are recorded by the middleware in main.py and labelled with
+# the route template (e.g. /jobs/{job_id}) to keep label cardinality bounded.
+# Connection pool and password hashing figures are read when /metrics is
+# scraped rather than tracked on every request; only the time spent waiting
+# for a pooled connection is recorded as it happens.
+# Under gunicorn (PROMETHEUS_MULTIPROC_DIR set) request and query metrics are
+# summed across workers; pool and hashing figures are those of the worker
+# answering the scrape.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Checkouts from a warm pool take microseconds; the top bucket is the default pool timeout
+CHECKOUT_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025) + LATENCY_BUCKETS + (30,)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to produce the response headers",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Duration of individual SQL statements", buckets=LATENCY_BUCKETS
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time from requesting a pooled connection until it is handed out",
+    ["engine"], buckets=CHECKOUT_WAIT_BUCKETS
+)
+
+def route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+def observe_request(method: str, route: str, status_code: int, duration: float, stats: QueryStats):
+    REQUESTS.labels(method, route, str(status_code)).inc()
+    REQUEST_DURATION.labels(method, route).observe(duration)
+    REQUEST_DB_DURATION.labels(method, route).observe(stats.duration)
+    REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+
+def observe_query(duration: float):
+    QUERY_DURATION.observe(duration)
+
+def server_timing(duration: float, stats: QueryStats) -> str:
+    """Server-Timing header value splitting the request into SQL and application time."""
+    app_ms = max(0.0, duration - stats.duration) * 1000
+    return (
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+        f"app;dur={app_ms:.1f}, total;dur={duration * 1000:.1f}"
+    )
+
+_timed_engines = set()
+
+def time_checkouts(engines: dict):
+    """Record how long each engine's connection checkouts take, labelled by name.
+
+    Includes waiting for a free connection when the pool is exhausted and
+    opening a new one. The engine's raw_connection() is wrapped rather than
+    its pool, which engine.dispose() replaces.
+    """
+    for name, engine in engines.items():
+        if engine in _timed_engines:
+            continue
+        _timed_engines.add(engine)
+        histogram = POOL_CHECKOUT_WAIT.labels(name)
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection(raw_connection=raw_connection, histogram=histogram):
+            started = time.perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        engine.raw_connection = timed_raw_connection
+
+class PoolCollector:
+    """Connection pool occupancy of the given engines, labelled by name."""
+
+    def __init__(self, engines: dict):
+        self.engines = engines
+
+    def collect(self):
+        gauges = {
+            "size": GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"]),
+            "checkedout": GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["engine"]),
+            "checkedin": GaugeMetricFamily("db_pool_checked_in", "Idle connections in the pool", labels=["engine"]),
+            "overflow": GaugeMetricFamily("db_pool_overflow", "Connections opened beyond the pool size", labels=["engine"]),
+        }
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            for method, gauge in gauges.items():
+                # Not every pool class (e.g. SQLite's StaticPool) reports occupancy
+                if hasattr(pool, method):
+                    gauge.add_metric([name], getattr(pool, method)())
+        yield from gauges.values()
+
+class HashingCollector:
+    """Password hashing executor load and queueing."""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+
+    def collect(self):
+        hasher = self.hasher
+        yield GaugeMetricFamily("password_hash_in_flight", "Hashes running or queued", value=hasher.in_flight)
+        yield GaugeMetricFamily("password_hash_workers", "Hashing executor size", value=hasher.workers)
+        yield CounterMetricFamily("password_hash_rejected", "Hashes rejected as busy", value=hasher.rejected)
+        yield SummaryMetricFamily(
+            "password_hash_wait_seconds", "Time hashes waited for an executor worker",
+            count_value=hasher.completed, sum_value=hasher.wait_seconds
+        )
+        yield SummaryMetricFamily(
+            "password_hash_seconds", "Time spent hashing on the executor",
+            count_value=hasher.completed, sum_value=hasher.hash_seconds
+        )
+
+_collectors = []
+
+def register_collectors(engines: dict, hasher):
+    """Register the scrape-time collectors, replacing those of an earlier app instance."""
+    for collector in _collectors:
+        REGISTRY.unregister(collector)
+    _collectors[:] = [PoolCollector(engines), HashingCollector(hasher)]
+    for collector in _collectors:
+        REGISTRY.register(collector)
+
+def render() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _collectors:
+        registry.register(collector)
+    return generate_latest(registry)
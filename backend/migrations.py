@@ -0,0 +1,210 @@
+import time
+from contextlib import contextmanager
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, literal, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from models import Base, Job, Application, ResumeBlob, ResumeText, JobFacet, JobApplicationCount, ChangeVersion
+from database import is_postgres
+from search import create_resume_search_index, create_search_index
+import facets
+
+# Versioned schema migrations.
+# Each migration runs once, in order, inside its own transaction and is recorded
+# in the schema_migrations table. Migrations must be idempotent so they can also
+# bring databases created by the old bare `create_all` up to date.
+# migrate() holds a lock for the whole run (a PostgreSQL advisory lock, or a
+# row in schema_migrations_lock on SQLite), so replicas and workers starting
+# together apply each migration exactly once.
+
+# Key of the PostgreSQL advisory lock; any constant unique to this app
+MIGRATION_LOCK_KEY = 7245319
+# How long to wait for another process's migrations; a SQLite lock row older
+# than this is treated as left behind by a crashed process
+MIGRATION_LOCK_TIMEOUT_SECONDS = 600
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def _create_tables(conn):
+    Base.metadata.create_all(bind=conn)
+
+def _create_indexes(conn, model, *names):
+    # Indexes are declared on the models; migrations create them by name
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(bind=conn, checkfirst=True)
+
+def _create_filter_indexes(conn):
+    _create_indexes(conn, Job, "ix_jobs_status_salary", "ix_jobs_created_at_id")
+    _create_indexes(
+        conn, Application,
+        "ux_applications_user_job", "ix_applications_job_id", "ix_applications_created_at_id"
+    )
+    if is_postgres(conn):
+        # Trigram index so `location ILIKE '%...%'` can use an index scan
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_location_trgm "
+            "ON jobs USING GIN (location gin_trgm_ops)"
+        ))
+
+def _add_user_token_version(conn):
+    if not _has_column(conn, "users", "token_version"):
+        conn.execute(text("ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
+
+def _add_application_resume_sha256(conn):
+    if not _has_column(conn, "applications", "resume_sha256"):
+        conn.execute(text("ALTER TABLE applications ADD COLUMN resume_sha256 VARCHAR(64)"))
+
+def _create_resume_blobs(conn):
+    ResumeBlob.__table__.create(bind=conn, checkfirst=True)
+    _create_indexes(conn, Application, "ix_applications_resume_sha256")
+
+def _add_job_external_id(conn):
+    if not _has_column(conn, "jobs", "external_id"):
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN external_id VARCHAR"))
+    _create_indexes(conn, Job, "ux_jobs_external_id")
+
+def _create_job_facets(conn):
+    if not _has_column(conn, "jobs", "application_count"):
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN application_count INTEGER NOT NULL DEFAULT 0"))
+    JobFacet.__table__.create(bind=conn, checkfirst=True)
+    # Backfill the counters; the session joins this migration's transaction
+    with Session(bind=conn) as session:
+        facets.reconcile(session)
+
+def _create_job_application_counts(conn):
+    JobApplicationCount.__table__.create(bind=conn, checkfirst=True)
+    _create_indexes(conn, Job, "ix_jobs_application_count")
+    _create_indexes(
+        conn, Application,
+        "ix_applications_job_created_at_id", "ix_applications_job_status_created_at_id"
+    )
+    with Session(bind=conn) as session:
+        facets.reconcile(session)
+
+def _add_version_tokens(conn):
+    # Indexed change times make the ETag version tokens single index lookups
+    if not _has_column(conn, "applications", "updated_at"):
+        column_type = Application.__table__.c.updated_at.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE applications ADD COLUMN updated_at {column_type}"))
+    _create_indexes(conn, Job, "ix_jobs_updated_at")
+    _create_indexes(conn, Application, "ix_applications_updated_at")
+
+def _create_resume_texts(conn):
+    ResumeText.__table__.create(bind=conn, checkfirst=True)
+    _create_indexes(conn, ResumeText, "ix_resume_texts_status")
+    create_resume_search_index(conn)
+    # Existing resumes are queued for extraction by `python resumetext.py backfill`
+    conn.execute(
+        ResumeText.__table__.insert().from_select(
+            ["sha256", "status"],
+            select(ResumeBlob.sha256, literal("pending"))
+            .where(ResumeBlob.sha256.notin_(select(ResumeText.sha256)))
+        )
+    )
+
+def _create_change_versions(conn):
+    ChangeVersion.__table__.create(bind=conn, checkfirst=True)
+    existing = set(conn.scalars(select(ChangeVersion.name)))
+    rows = [{"name": name, "version": 0} for name in facets.VERSIONS if name not in existing]
+    if rows:
+        conn.execute(ChangeVersion.__table__.insert(), rows)
+
+def _create_status_cursor_index(conn):
+    # (status, created_at, id) serves status-filtered cursor pages and
+    # supersedes the (status, created_at) index
+    _create_indexes(conn, Job, "ix_jobs_status_created_at_id")
+    conn.execute(text("DROP INDEX IF EXISTS ix_jobs_status_created_at"))
+
+MIGRATIONS = [
+    (1, "create tables", _create_tables),
+    (2, "jobs full-text search", create_search_index),
+    (3, "job filter and application indexes", _create_filter_indexes),
+    (4, "user token version", _add_user_token_version),
+    (5, "application resume hash", _add_application_resume_sha256),
+    (6, "content-addressed resume blobs", _create_resume_blobs),
+    (7, "job external id", _add_job_external_id),
+    (8, "job facets and applicant counts", _create_job_facets),
+    (9, "per-status applicant counts", _create_job_application_counts),
+    (10, "change times for ETags", _add_version_tokens),
+    (11, "extracted resume text", _create_resume_texts),
+    (12, "change counters for ETags", _create_change_versions),
+    (13, "status cursor index", _create_status_cursor_index),
+]
+
+def _has_column(conn, table_name: str, column_name: str) -> bool:
+    return any(c["name"] == column_name for c in inspect(conn).get_columns(table_name))
+
+def applied_versions(conn):
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+@contextmanager
+def _postgres_lock(engine):
+    # Session-level lock, held by this connection while the migrations run
+    # on others
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+@contextmanager
+def _sqlite_lock(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations_lock (id INTEGER PRIMARY KEY, locked_at FLOAT NOT NULL)"
+        ))
+    deadline = time.monotonic() + MIGRATION_LOCK_TIMEOUT_SECONDS
+    while True:
+        with engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM schema_migrations_lock WHERE locked_at < :stale"),
+                {"stale": time.time() - MIGRATION_LOCK_TIMEOUT_SECONDS}
+            )
+            acquired = conn.execute(
+                text("INSERT OR IGNORE INTO schema_migrations_lock (id, locked_at) VALUES (1, :now)"),
+                {"now": time.time()}
+            ).rowcount
+        if acquired:
+            break
+        if time.monotonic() > deadline:
+            raise RuntimeError("Timed out waiting for another process to finish migrating")
+        time.sleep(0.2)
+    try:
+        yield
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM schema_migrations_lock WHERE id = 1"))
+
+def migrate(engine):
+    """Apply all pending migrations. Returns the list of versions applied."""
+    lock = _postgres_lock if is_postgres(engine) else _sqlite_lock
+    with lock(engine):
+        schema_migrations.create(bind=engine, checkfirst=True)
+        with engine.connect() as conn:
+            done = applied_versions(conn)
+
+        applied = []
+        for version, name, upgrade in MIGRATIONS:
+            if version in done:
+                continue
+            with engine.begin() as conn:
+                upgrade(conn)
+                conn.execute(schema_migrations.insert().values(version=version, name=name))
+            applied.append(version)
+    return applied
+
+if __name__ == "__main__":
+    from database import engine
+    applied = migrate(engine)
+    print(f"Applied migrations: {applied}" if applied else "Database schema is up to date")
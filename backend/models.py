@@ -1,8 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 
+# SQLite's CURRENT_TIMESTAMP has second resolution; binding datetimes in the same
+# format keeps keyset comparisons on created_at consistent with stored values.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -11,6 +18,8 @@ class User(Base):
     username = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     is_admin = Column(Boolean, default=False)
+    # Bumped to revoke every token issued to the user
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     applications = relationship("Application", back_populates="user")
@@ -24,11 +33,22 @@ class Job(Base):
     location = Column(String, index=True)
     salary = Column(Float)
     status = Column(String, default="active")  # active, inactive, filled
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    external_id = Column(String, nullable=True)  # partner feed id, used to upsert bulk imports
+    application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(Timestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     applications = relationship("Application", back_populates="job")
 
+    __table_args__ = (
+        Index("ix_jobs_status_salary", "status", "salary"),
+        Index("ix_jobs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ux_jobs_external_id", "external_id", unique=True),
+        Index("ix_jobs_application_count", "application_count"),
+        Index("ix_jobs_updated_at", "updated_at"),
+    )
+
 class Application(Base):
     __tablename__ = "applications"
     
@@ -38,9 +58,68 @@ class Application(Base):
     name = Column(String)
     email = Column(String)
     resume_url = Column(String)
+    resume_sha256 = Column(String(64), nullable=True)
     cover_letter = Column(Text, nullable=True)
     status = Column(String, default="pending")  # pending, reviewed, accepted, rejected
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="applications")
-    job = relationship("Job", back_populates="applications") 
\ No newline at end of file
+    job = relationship("Job", back_populates="applications")
+
+    __table_args__ = (
+        Index("ux_applications_user_job", "user_id", "job_id", unique=True),
+        Index("ix_applications_job_id", "job_id"),
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_resume_sha256", "resume_sha256"),
+        Index("ix_applications_job_created_at_id", "job_id", "created_at", "id"),
+        Index("ix_applications_job_status_created_at_id", "job_id", "status", "created_at", "id"),
+        Index("ix_applications_updated_at", "updated_at"),
+    )
+
+class ResumeBlob(Base):
+    """A stored resume file, shared by every application that uploaded the same bytes."""
+    __tablename__ = "resume_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(Timestamp, server_default=func.now())
+
+class ResumeText(Base):
+    """Text extracted from a stored resume, kept once per blob like the file itself."""
+    __tablename__ = "resume_texts"
+    
+    sha256 = Column(String(64), primary_key=True)
+    status = Column(String, nullable=False, default="pending")  # pending, extracted, unsupported, failed
+    content = Column(Text, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
+    extracted_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_resume_texts_status", "status"),
+    )
+
+class JobApplicationCount(Base):
+    """Number of applications to a job with a given status."""
+    __tablename__ = "job_application_counts"
+    
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class JobFacet(Base):
+    """Number of jobs with a given status, location or salary bucket."""
+    __tablename__ = "job_facets"
+    
+    facet = Column(String, primary_key=True)  # status, location, salary
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class ChangeVersion(Base):
+    """Write counter of a group of tables; ETag version tokens are built from it."""
+    __tablename__ = "change_versions"
+
+    name = Column(String, primary_key=True)  # jobs, applications
+    version = Column(Integer, nullable=False, default=0)
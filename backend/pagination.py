@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import tuple_
+
+# Keyset (cursor) pagination helpers.
+# A cursor is the (created_at, id) of the last row of the previous page,
+# encoded as an opaque url-safe token so clients never depend on its shape.
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor token. Returns None for the first page (empty cursor)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def keyset_after(model, after: Tuple[datetime, int]):
+    """Filter clause selecting rows strictly after `after` in (created_at, id) order."""
+    # A row-value comparison is a single range on the (..., created_at, id)
+    # indexes. `after` stays a plain tuple so each value is bound with its
+    # column's type (created_at is stored as text on SQLite).
+    return tuple_(model.created_at, model.id) > tuple(after)
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """Cursor for the page following `rows`, fetched with `limit + 1`."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,393 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func, or_, select, type_coerce
+from config import settings
+from models import Job, Timestamp
+
+# Similar jobs and job recommendations from TF-IDF vectors.
+# Title and description terms are hashed into a fixed number of dimensions
+# (the hashing trick), so there is no vocabulary to refit and a job can be
+# added or replaced one row at a time. Rows are L2-normalized TF-IDF vectors in
+# a SciPy CSR matrix, so memory grows with the distinct terms per job rather
+# than the dimensions, and cosine similarity against every job is a single
+# sparse matrix-vector product followed by a partial sort for the top k.
+# Changed rows are kept aside and merged into the matrix in batches.
+# The lifespan loads the snapshot or builds the index in a background thread;
+# until then similar-jobs queries raise IndexNotReady.
+# crud updates this process's index on job writes; other processes pick the
+# changes up from jobs.updated_at every SIMILAR_JOBS_REFRESH_SECONDS.
+# `python recommendations.py` rebuilds the index, refreshing the IDF weights,
+# and writes the snapshot that workers load on startup instead of rebuilding.
+
+logger = logging.getLogger(__name__)
+
+TITLE_WEIGHT = 2
+# Changed rows held outside the CSR matrix before they are merged into it
+COMPACT_ROWS = 1024
+# Rows committed slightly out of timestamp order are still picked up
+SYNC_OVERLAP = timedelta(seconds=60)
+STOP_WORDS = frozenset("""
+a about all an and are as at be been but by can for from has have in into is it its
+our of on or that the their this to we will with you your
+""".split())
+
+_token_pattern = re.compile(r"\w[\w+#]*")
+
+# When a job last changed; SQLite stores whole seconds, so compare in that format
+_changed_at = type_coerce(func.coalesce(Job.updated_at, Job.created_at), Timestamp)
+_updated_at = type_coerce(Job.updated_at, Timestamp)
+
+# A sparse row: sorted column indices and their values
+SparseRow = Tuple[np.ndarray, np.ndarray]
+
+class IndexNotReady(Exception):
+    """The index is still being built."""
+
+def tokenize(text: Optional[str]) -> List[str]:
+    tokens = _token_pattern.findall((text or "").lower())
+    return [token for token in tokens if len(token) > 1 and token not in STOP_WORDS]
+
+def term_frequencies(title: Optional[str], description: Optional[str], dimensions: int) -> SparseRow:
+    """Sublinear term frequencies of a job, hashed into `dimensions` buckets."""
+    buckets = [zlib.crc32(token.encode()) % dimensions for token in tokenize(title)]
+    weights = [TITLE_WEIGHT] * len(buckets)
+    for token in tokenize(description):
+        buckets.append(zlib.crc32(token.encode()) % dimensions)
+        weights.append(1)
+    indices, inverse = np.unique(np.asarray(buckets, dtype=np.int64), return_inverse=True)
+    counts = np.bincount(inverse, weights=weights, minlength=len(indices))
+    return indices.astype(np.int32), np.log1p(counts).astype(np.float32)
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(values, axis=-1, keepdims=True)
+    return np.divide(values, norms, out=np.zeros_like(values), where=norms > 0)
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1), dtype=np.float32).ravel())
+    scale = np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)
+    matrix.data *= np.repeat(scale, np.diff(matrix.indptr))
+    return matrix
+
+def _empty_matrix(rows: int, dimensions: int) -> sparse.csr_matrix:
+    return sparse.csr_matrix((rows, dimensions), dtype=np.float32)
+
+class JobIndex:
+    """TF-IDF vectors of all jobs with top-k cosine similarity queries.
+
+    Writers hold the lock; queries only take it to grab the current arrays,
+    so a matrix product never blocks updates.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.idf = np.ones(dimensions, dtype=np.float32)
+        self.matrix = _empty_matrix(0, dimensions)
+        # Rows added or replaced since the last merge; they shadow `matrix`
+        self.changed = {}
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self.size = 0
+        self.rows = {}
+        # Latest jobs change time folded into the index
+        self.watermark: Optional[datetime] = None
+        self.loaded = False
+        self.synced_at = 0.0
+        self._lock = threading.RLock()
+        self._builder: Optional[threading.Thread] = None
+        self._session_factory = None
+
+    def _reset(self, job_ids, matrix, active, idf, watermark):
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        self.matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+        self.changed = {}
+        self.active = np.asarray(active, dtype=bool)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.size = len(self.job_ids)
+        self.rows = {int(job_id): row for row, job_id in enumerate(self.job_ids) if job_id >= 0}
+        self.watermark = watermark
+        self.loaded = True
+
+    def build(self, db):
+        """Recompute every vector and the IDF weights from the jobs table."""
+        job_ids, active, indices, values = [], [], [], []
+        indptr = [0]
+        watermark = None
+        for job_id, title, description, status, changed_at in db.execute(
+            select(Job.id, Job.title, Job.description, Job.status, _changed_at).execution_options(yield_per=1000)
+        ):
+            job_ids.append(job_id)
+            active.append(status == "active")
+            row_indices, row_values = term_frequencies(title, description, self.dimensions)
+            indices.append(row_indices)
+            values.append(row_values)
+            indptr.append(indptr[-1] + len(row_indices))
+            if changed_at is not None and (watermark is None or changed_at > watermark):
+                watermark = changed_at
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+        values = np.concatenate(values) if values else np.zeros(0, dtype=np.float32)
+        document_frequency = np.bincount(indices, minlength=self.dimensions)
+        idf = (np.log((1 + len(job_ids)) / (1 + document_frequency)) + 1).astype(np.float32)
+        values *= idf[indices]
+        matrix = sparse.csr_matrix(
+            (values, indices, np.asarray(indptr, dtype=np.int64)), shape=(len(job_ids), self.dimensions)
+        )
+        with self._lock:
+            self._reset(job_ids, _normalize_rows(matrix), active, idf, watermark)
+            self.synced_at = time.monotonic()
+
+    def build_in_background(self, session_factory, path: Optional[str] = None):
+        """Build the index in a daemon thread and write the snapshot to `path`.
+
+        Queries raise IndexNotReady until it is done. A no-op while a build runs.
+        """
+        with self._lock:
+            self._session_factory = session_factory
+            if self._builder is not None and self._builder.is_alive():
+                return
+            self._builder = threading.Thread(
+                target=self._build_and_save, args=(session_factory, path), name="job-index-build", daemon=True
+            )
+            self._builder.start()
+
+    def _build_and_save(self, session_factory, path: Optional[str]):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            self.build(db)
+            if path:
+                self.save(path)
+            logger.info("Indexed %d jobs in %.2fs", len(self.rows), time.perf_counter() - started)
+        except Exception:
+            logger.exception("Building the job index failed")
+        finally:
+            db.close()
+
+    def _vector(self, title, description) -> SparseRow:
+        indices, values = term_frequencies(title, description, self.dimensions)
+        return indices, _normalize(values * self.idf[indices])
+
+    def upsert(self, job_id: int, title, description, status):
+        """Add or replace one job. A no-op until the index is loaded; the first load reads it anyway."""
+        if not self.loaded:
+            return
+        self._apply([(job_id, self._vector(title, description), status == "active")])
+
+    def _apply(self, updates: List[Tuple[int, SparseRow, bool]]):
+        with self._lock:
+            for job_id, vector, active in updates:
+                row = self.rows.get(job_id)
+                if row is None:
+                    if self.size == len(self.job_ids):
+                        self._grow()
+                    row = self.size
+                    self.size += 1
+                    self.rows[job_id] = row
+                    self.job_ids[row] = job_id
+                self.changed[row] = vector
+                self.active[row] = active
+            if len(self.changed) >= COMPACT_ROWS:
+                self._compact()
+
+    def _grow(self):
+        # Double the capacity so appends are amortized O(1)
+        capacity = max(64, 2 * len(self.job_ids))
+        job_ids = np.full(capacity, -1, dtype=np.int64)
+        job_ids[:self.size] = self.job_ids[:self.size]
+        active = np.zeros(capacity, dtype=bool)
+        active[:self.size] = self.active[:self.size]
+        self.job_ids, self.active = job_ids, active
+
+    def _compact(self):
+        """Merge the changed rows into the CSR matrix (a new one; queries may hold the old)."""
+        if not self.changed:
+            return
+        matrix = self.matrix
+        if matrix.shape[0] < self.size:
+            matrix = sparse.vstack([matrix, _empty_matrix(self.size - matrix.shape[0], self.dimensions)], format="csr")
+        rows = np.fromiter(self.changed, dtype=np.int64, count=len(self.changed))
+        keep = np.ones(self.size, dtype=np.float32)
+        keep[rows] = 0
+        vectors = [self.changed[row] for row in rows]
+        lengths = [len(indices) for indices, _ in vectors]
+        replacements = sparse.csr_matrix(
+            (np.concatenate([values for _, values in vectors]),
+             (np.repeat(rows, lengths), np.concatenate([indices for indices, _ in vectors]))),
+            shape=(self.size, self.dimensions), dtype=np.float32
+        )
+        matrix = (sparse.diags(keep, format="csr") @ matrix + replacements).tocsr()
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+        self.matrix = matrix
+        self.changed = {}
+
+    def remove(self, job_id: int):
+        with self._lock:
+            row = self.rows.pop(job_id, None)
+            if row is not None:
+                self.job_ids[row] = -1
+                self.active[row] = False
+                self.changed[row] = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+                if len(self.changed) >= COMPACT_ROWS:
+                    self._compact()
+
+    def sync(self, db) -> int:
+        """Fold in jobs created or changed since the watermark. Returns the number of jobs read."""
+        query = select(Job.id, Job.title, Job.description, Job.status, _changed_at)
+        if self.watermark is not None:
+            # Each column on its own, so both ix_jobs_updated_at and
+            # ix_jobs_created_at_id apply; coalesce() would need a full scan
+            since = self.watermark - SYNC_OVERLAP
+            query = query.where(or_(_updated_at >= since, Job.created_at >= since))
+        updates = []
+        watermark = self.watermark
+        for job_id, title, description, status, changed_at in db.execute(query):
+            updates.append((job_id, self._vector(title, description), status == "active"))
+            if changed_at is not None and (watermark is None or changed_at > watermark):
+                watermark = changed_at
+        # One merge for the whole batch, e.g. after a bulk import
+        self._apply(updates)
+        self.watermark = watermark
+        self.synced_at = time.monotonic()
+        return len(updates)
+
+    def ensure_current(self, db):
+        """Sync periodically. Raises IndexNotReady until the snapshot is loaded or the build is done."""
+        if not self.loaded:
+            if self._session_factory is not None:
+                # Retries a background build that failed
+                self.build_in_background(self._session_factory, settings.SIMILAR_JOBS_INDEX_PATH)
+            raise IndexNotReady()
+        if time.monotonic() - self.synced_at < settings.SIMILAR_JOBS_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if time.monotonic() - self.synced_at >= settings.SIMILAR_JOBS_REFRESH_SECONDS:
+                self.sync(db)
+
+    def mark_stale(self):
+        """Sync on the next query, e.g. after a bulk write that skipped upsert()."""
+        self.synced_at = 0.0
+
+    def _row(self, row: int) -> SparseRow:
+        vector = self.changed.get(row)
+        if vector is not None:
+            return vector
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        return self.matrix.indices[start:end], self.matrix.data[start:end]
+
+    def _dense(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        vector[indices] = values
+        return vector
+
+    def _top_k(self, query: np.ndarray, limit: int, exclude: Iterable[int]) -> List[Tuple[int, float]]:
+        with self._lock:
+            size = self.size
+            matrix, changed = self.matrix, list(self.changed.items())
+            job_ids, active = self.job_ids[:size], self.active[:size]
+            excluded = [self.rows[job_id] for job_id in exclude if job_id in self.rows]
+        if not size or limit <= 0:
+            return []
+        scores = np.zeros(size, dtype=np.float32)
+        scores[:matrix.shape[0]] = matrix @ query
+        for row, (indices, values) in changed:
+            scores[row] = values @ query[indices]
+        scores[~active] = -np.inf
+        scores[excluded] = -np.inf
+        k = min(limit, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(job_ids[row]), float(scores[row])) for row in top if scores[row] > 0]
+
+    def similar(self, job_id: int, limit: int) -> Optional[List[Tuple[int, float]]]:
+        """Most similar active jobs as (job_id, score) pairs, or None if the job is not indexed."""
+        with self._lock:
+            row = self.rows.get(job_id)
+            if row is None:
+                return None
+            query = self._dense(*self._row(row))
+        return self._top_k(query, limit, [job_id])
+
+    def recommend(self, job_ids: List[int], limit: int) -> List[Tuple[int, float]]:
+        """Active jobs closest to the centroid of `job_ids`, excluding those jobs."""
+        profile = np.zeros(self.dimensions, dtype=np.float32)
+        with self._lock:
+            rows = [self.rows[job_id] for job_id in job_ids if job_id in self.rows]
+            for row in rows:
+                indices, values = self._row(row)
+                profile[indices] += values
+        if not rows:
+            return []
+        return self._top_k(_normalize(profile), limit, job_ids)
+
+    def save(self, path: str):
+        """Write a snapshot atomically, so workers never load a partial file."""
+        with self._lock:
+            self._compact()
+            size = self.size
+            matrix = self.matrix
+            arrays = dict(
+                dimensions=np.int64(self.dimensions),
+                idf=self.idf,
+                data=matrix.data,
+                indices=matrix.indices,
+                indptr=matrix.indptr,
+                job_ids=self.job_ids[:size],
+                active=self.active[:size],
+                watermark=np.array(self.watermark.isoformat() if self.watermark else ""),
+            )
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, path: str) -> bool:
+        """Load a snapshot written by save(). Returns False if it is missing or built differently."""
+        try:
+            with np.load(path) as snapshot:
+                if int(snapshot["dimensions"]) != self.dimensions or "indptr" not in snapshot.files:
+                    logger.warning("Ignoring job index snapshot %s built with other dimensions", path)
+                    return False
+                job_ids = snapshot["job_ids"]
+                matrix = sparse.csr_matrix(
+                    (snapshot["data"], snapshot["indices"], snapshot["indptr"]),
+                    shape=(len(job_ids), self.dimensions)
+                )
+                watermark = str(snapshot["watermark"])
+                with self._lock:
+                    self._reset(
+                        job_ids, matrix, snapshot["active"], snapshot["idf"],
+                        datetime.fromisoformat(watermark) if watermark else None
+                    )
+                    # Jobs changed since the snapshot was written are read on the next query
+                    self.synced_at = 0.0
+        except FileNotFoundError:
+            return False
+        return True
+
+job_index = JobIndex(settings.SIMILAR_JOBS_DIMENSIONS)
+
+if __name__ == "__main__":
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        job_index.build(db)
+        job_index.save(settings.SIMILAR_JOBS_INDEX_PATH)
+        print(f"Indexed {len(job_index.rows)} jobs ({job_index.matrix.nnz} terms) in "
+              f"{time.perf_counter() - started:.2f}s; snapshot written to {settings.SIMILAR_JOBS_INDEX_PATH}")
+    finally:
+        db.close()
@@ -0,0 +1,264 @@
+import asyncio
+import io
+import logging
+import os
+import re
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from xml.etree import ElementTree
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+from config import settings
+from database import SessionLocal
+from models import Application, ResumeText
+from blobstore import resume_key
+from storage import resume_storage
+import search
+
+# Background text extraction for uploaded resumes.
+# Creating an application registers its resume blob in resume_texts as
+# "pending" (once per distinct file), and the route enqueues the hash after
+# the response is sent. Workers read the file from resume storage, parse it on
+# a process pool so PDF parsing never competes with request handling, then
+# store and index the text so admins can filter a job's applicants by keyword.
+# The queue is in-process by default; with RESUME_TEXT_QUEUE=redis hashes are
+# pushed to a Redis list served by `python resumetext.py worker`. Pending rows
+# are the source of truth: `python resumetext.py backfill` re-queues anything
+# a restart dropped. A parse that exceeds RESUME_TEXT_TIMEOUT_SECONDS has its
+# pool's processes killed and the pool replaced.
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "resume_text:queue"
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+# Uncompressed size limit for a DOCX body, against zip bombs
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+_WORD = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def _pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        if archive.getinfo("word/document.xml").file_size > MAX_DOCX_XML_BYTES:
+            raise ValueError("Document body too large")
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    return "\n".join(
+        "".join(node.text or "" for node in paragraph.iter(f"{_WORD}t"))
+        for paragraph in root.iter(f"{_WORD}p")
+    )
+
+def extract_text(data: bytes, extension: str, max_chars: int) -> str:
+    """Plain text of a PDF or DOCX file. Runs on the extraction process pool."""
+    text = _pdf_text(data) if extension == ".pdf" else _docx_text(data)
+    # Collapse layout whitespace so the stored text stays compact
+    text = re.sub(r"[^\S\n]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text).strip()
+    return text[:max_chars]
+
+class ResumeIndexer:
+    """Queues resume hashes and extracts their text on a process pool."""
+
+    def __init__(self, workers: int = 2, backend: str = "local"):
+        self.workers = workers
+        self.backend = backend
+        self.queued = 0
+        # Resumes processed by this process, by resulting status
+        self.processed = {"extracted": 0, "unsupported": 0, "failed": 0}
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._queue = None
+        self._tasks = []
+        self._redis = None
+
+    def _get_executor(self):
+        # Created lazily so importing the app never forks worker processes
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _recycle_executor(self, executor: ProcessPoolExecutor):
+        """Kill `executor`'s processes, e.g. one stuck parsing, and start a new pool on next use."""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        # shutdown() would wait for the stuck task; there is no public way to
+        # stop a busy worker before Python 3.14
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _run(self, fn, *args):
+        """Run `fn(*args)` on the process pool within RESUME_TEXT_TIMEOUT_SECONDS.
+
+        On timeout the pool is recycled, which also breaks the other
+        extractions running on it; those are retried once on the new pool.
+        """
+        for attempt in range(2):
+            executor = self._get_executor()
+            future = None
+            try:
+                future = executor.submit(fn, *args)
+                return future.result(timeout=settings.RESUME_TEXT_TIMEOUT_SECONDS)
+            except TimeoutError:
+                self._recycle_executor(executor)
+                raise
+            except BrokenProcessPool:
+                self._recycle_executor(executor)
+                if attempt:
+                    raise
+            except RuntimeError:
+                # submit() on a pool another thread has just recycled
+                if future is not None or attempt:
+                    raise
+
+    def _get_redis(self):
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis.from_url(settings.REDIS_URL)
+        return self._redis
+
+    async def enqueue(self, sha256: str):
+        """Queue a resume for extraction; returns without waiting for it."""
+        if self.backend == "redis":
+            await run_in_threadpool(self._get_redis().lpush, QUEUE_KEY, sha256)
+        else:
+            if self._queue is None:
+                # Consumers live on the event loop serving requests
+                self._queue = asyncio.Queue()
+                self._tasks = [asyncio.create_task(self._consume(self._queue)) for _ in range(self.workers)]
+            self._queue.put_nowait(sha256)
+        self.queued += 1
+
+    async def _consume(self, queue: asyncio.Queue):
+        # The queue is passed in: shutdown() drops self._queue while we may still be cancelled mid-item
+        while True:
+            sha256 = await queue.get()
+            try:
+                await run_in_threadpool(self.process, sha256)
+            except Exception:
+                logger.exception("Resume text extraction failed for %s", sha256)
+            finally:
+                queue.task_done()
+
+    def process(self, sha256: str) -> Optional[str]:
+        """Extract, store and index one pending resume.
+
+        Returns the resulting status, or None when the resume is not pending
+        (already handled, e.g. queued twice). No database connection is held
+        while the file is parsed.
+        """
+        with SessionLocal() as db:
+            if db.scalar(select(ResumeText.status).where(ResumeText.sha256 == sha256)) != "pending":
+                return None
+            resume_url = db.scalar(
+                select(Application.resume_url).where(Application.resume_sha256 == sha256).limit(1)
+            )
+
+        status, content, error = "extracted", None, None
+        key = resume_key(resume_url) if resume_url else None
+        extension = os.path.splitext(key)[1].lower() if key else ""
+        if extension and extension not in SUPPORTED_EXTENSIONS:
+            status = "unsupported"
+        elif key is None or not resume_storage.exists(key):
+            status, error = "failed", "Resume file not found"
+        else:
+            data = b"".join(resume_storage.read_chunks(key))
+            try:
+                content = self._run(extract_text, data, extension, settings.RESUME_TEXT_MAX_CHARS)
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"[:500]
+
+        with SessionLocal() as db:
+            updated = db.query(ResumeText).filter(
+                ResumeText.sha256 == sha256, ResumeText.status == "pending"
+            ).update(
+                {"status": status, "content": content, "error": error, "extracted_at": func.now()},
+                synchronize_session=False
+            )
+            if not updated:
+                # Another worker got there first
+                return None
+            if content:
+                search.index_resume_text(db, sha256, content)
+            db.commit()
+        self.processed[status] += 1
+        return status
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "queued": self.queued,
+            "pending": self._queue.qsize() if self._queue is not None else None,
+            **self.processed,
+        }
+
+    def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def aclose(self):
+        """shutdown(), then wait until the cancelled consumers have finished."""
+        tasks = self._tasks
+        self.shutdown()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def pending_resumes(db) -> List[str]:
+    return list(db.scalars(select(ResumeText.sha256).where(ResumeText.status == "pending")))
+
+def serve(indexer: ResumeIndexer):
+    """Extract resumes pushed to the Redis queue until interrupted."""
+    client = indexer._get_redis()
+
+    def consume():
+        while True:
+            item = client.brpop(QUEUE_KEY, timeout=5)
+            if item is None:
+                continue
+            try:
+                indexer.process(item[1].decode())
+            except Exception:
+                logger.exception("Resume text extraction failed for %s", item[1])
+
+    # One consumer per pool process keeps every process busy
+    with ThreadPoolExecutor(max_workers=indexer.workers) as consumers:
+        for _ in range(indexer.workers):
+            consumers.submit(consume)
+
+resume_indexer = ResumeIndexer(workers=settings.RESUME_TEXT_WORKERS, backend=settings.RESUME_TEXT_QUEUE)
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "backfill"
+    if command == "worker":
+        logging.basicConfig(level=logging.INFO)
+        serve(resume_indexer)
+    elif command == "backfill":
+        with SessionLocal() as db:
+            pending = pending_resumes(db)
+        if resume_indexer.backend == "redis":
+            # Leave the extraction to the running workers
+            for sha256 in pending:
+                resume_indexer._get_redis().lpush(QUEUE_KEY, sha256)
+            print(f"Queued {len(pending)} pending resumes")
+        else:
+            statuses = [resume_indexer.process(sha256) for sha256 in pending]
+            resume_indexer.shutdown()
+            print(f"Processed {len(pending)} pending resumes: "
+                  f"{statuses.count('extracted')} extracted, {len(pending) - statuses.count('extracted')} not")
+    else:
+        sys.exit("usage: python resumetext.py [backfill|worker]")
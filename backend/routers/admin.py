@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from database import get_db
+from auth import Principal, get_current_admin_user
+from crud import get_admin_stats_async, get_job_application_stats_async
+from schemas import AdminStats, JobApplicationStats
+
+router = APIRouter()
+
+@router.get("/stats", response_model=AdminStats)
+async def read_stats(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Dashboard totals: jobs and applications by status, recent applications and the most applied-to jobs (Admin only)"""
+    return await get_admin_stats_async(db)
+
+@router.get("/stats/jobs/{job_id}", response_model=JobApplicationStats)
+async def read_job_stats(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Applicant counts for a job, total and per status (Admin only)"""
+    stats = await get_job_application_stats_async(db, job_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return stats
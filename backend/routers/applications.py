@@ -1,59 +1,108 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from typing import List, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-import aiofiles
+from starlette.concurrency import run_in_threadpool
 import os
 from database import get_db
-from auth import get_current_user, get_current_admin_user
+from auth import Principal, get_current_user, get_current_admin_user
 from crud import (
-    get_applications, get_application, create_application, 
-    update_application, get_applications_by_job
+    get_applications_async, get_applications_after_async, get_application_async,
+    create_application_async, update_application_async, get_applications_by_job_async,
+    get_applications_by_job_after_async, get_applications_version_async, update_applications_bulk_async
 )
-from schemas import Application, ApplicationCreate, ApplicationUpdate, ApplicationWithJob
-from models import User
+from schemas import (
+    Application, ApplicationCreate, ApplicationUpdate, ApplicationWithJob, ApplicationPage, JobApplicationPage,
+    ApplicationBulkUpdate, ApplicationBulkResult
+)
+from pagination import decode_cursor, next_cursor
 from config import settings
+from uploads import UploadTooLarge
+from blobstore import resume_key, store_resume
+from storage import content_disposition, resume_storage
+from httpcache import (
+    http_date, if_range_matches, is_not_modified, not_modified_response, parse_byte_range, weak_etag
+)
+from resumetext import resume_indexer
 
 router = APIRouter()
 
-# Ensure upload directory exists
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+# Largest id list accepted by PATCH /applications/bulk
+MAX_BULK_IDS = 10000
 
-@router.get("/", response_model=List[ApplicationWithJob])
-def read_applications(
+@router.get("/", response_model=Union[List[ApplicationWithJob], ApplicationPage])
+async def read_applications(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination; pass an empty value for the first page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get applications for the current user"""
-    if current_user.is_admin:
-        # Admin can see all applications
-        applications = get_applications(db, skip=skip, limit=limit)
-    else:
-        # Regular users can only see their own applications
-        applications = get_applications(db, skip=skip, limit=limit, user_id=current_user.id)
+    """Get applications for the current user.
+
+    Responses carry a weak ETag built from a version token of the listed
+    applications and jobs; a matching If-None-Match is answered with 304
+    without loading the page.
+    """
+    # Admin can see all applications, regular users only their own
+    user_id = None if current_user.is_admin else current_user.id
+    version = await get_applications_version_async(db)
+    etag = weak_etag("applications", user_id, skip, limit, cursor, version)
+    validators = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, etag):
+        return not_modified_response(validators)
+    response.headers.update(validators)
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        applications = await get_applications_after_async(db, after=after, limit=limit + 1, user_id=user_id)
+        return {"items": applications[:limit], "next_cursor": next_cursor(applications, limit)}
+
+    applications = await get_applications_async(db, skip=skip, limit=limit, user_id=user_id)
     return applications
 
-@router.get("/job/{job_id}", response_model=List[Application])
-def read_applications_by_job(
+@router.get("/job/{job_id}", response_model=Union[List[Application], JobApplicationPage])
+async def read_applications_by_job(
     job_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None, description="Filter by application status"),
+    q: Optional[str] = Query(None, description="Keywords to match in the extracted resume text"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination; pass an empty value for the first page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
-    """Get all applications for a specific job (Admin only)"""
-    applications = get_applications_by_job(db, job_id=job_id)
-    return applications
+    """Get applications for a specific job, oldest first (Admin only).
+
+    `q` keeps applicants whose resume text matches; text is extracted in the
+    background shortly after each upload. Counts per status are available
+    from /admin/stats/jobs/{job_id}.
+    """
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        applications = await get_applications_by_job_after_async(
+            db, job_id, after=after, limit=limit + 1, status=status, q=q
+        )
+        return {"items": applications[:limit], "next_cursor": next_cursor(applications, limit)}
+
+    return await get_applications_by_job_async(db, job_id, skip=skip, limit=limit, status=status, q=q)
 
 @router.get("/{application_id}", response_model=ApplicationWithJob)
-def read_application(
+async def read_application(
     application_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get a specific application"""
-    application = get_application(db, application_id=application_id)
+    application = await get_application_async(db, application_id=application_id)
     if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     
@@ -63,86 +112,123 @@ def read_application(
     
     return application
 
-@router.get("/{application_id}/resume/download")
-def download_resume(
-    application_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Download resume file for an application"""
-    application = get_application(db, application_id=application_id)
+RESUME_CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+async def _get_resume_key(db: Session, application_id: int, current_user: Principal):
+    application = await get_application_async(db, application_id=application_id)
     if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    # Check if user has permission to download this resume
+    # Check if user has permission to access this resume
     if not current_user.is_admin and application.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     if not application.resume_url:
         raise HTTPException(status_code=404, detail="Resume not found")
-    # Extract filename from resume_url
-    filename = application.resume_url.split('/')[-1]
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
-    if not os.path.exists(file_path):
+    key = resume_key(application.resume_url)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    return application, key
+
+async def _resume_response(request: Request, application, key: str, media_type: str,
+                     filename: Optional[str] = None, inline: bool = False):
+    """Serve a resume with caching validators, honouring conditional and Range requests.
+
+    Stored resumes never change, so the content hash is a strong ETag and the
+    application's creation time its Last-Modified.
+    """
+    headers = {"Cache-Control": "private, no-cache"}
+    etag = f'"{application.resume_sha256}"' if application.resume_sha256 else None
+    if etag:
+        headers["ETag"] = etag
+    if application.created_at:
+        headers["Last-Modified"] = http_date(application.created_at)
+    if is_not_modified(request, etag, application.created_at):
+        return not_modified_response(headers)
+
+    # Redirect to the object store when it can serve the file itself
+    url = resume_storage.presigned_url(key, filename=filename, content_type=media_type, inline=inline)
+    if url:
+        return RedirectResponse(url, status_code=307)
+    file_path = resume_storage.local_path(key)
+    if file_path is not None:
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail="Resume file not found")
+        # FileResponse handles Range / If-Range (206) using the headers above
+        return FileResponse(
+            path=file_path,
+            filename=filename,
+            media_type=media_type,
+            content_disposition_type="inline" if inline else "attachment",
+            headers=headers
+        )
+    size = await run_in_threadpool(resume_storage.size, key)
+    if size is None:
         raise HTTPException(status_code=404, detail="Resume file not found")
+    if filename:
+        headers["Content-Disposition"] = content_disposition(filename, inline)
+    headers["Accept-Ranges"] = "bytes"
+    # Proxied from the object store: forward a single byte range to it
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and if_range_matches(request, etag, application.created_at):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(resume_storage.read_chunks(key), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        resume_storage.read_chunks(key, start=start, end=end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+@router.api_route("/{application_id}/resume/download", methods=["GET", "HEAD"])
+async def download_resume(
+    application_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Download resume file for an application"""
+    application, key = await _get_resume_key(db, application_id, current_user)
     # Get original filename for download
     original_filename = f"resume_{application.name}_{application.job.title}.pdf"
-    return FileResponse(
-        path=file_path,
-        filename=original_filename,
-        media_type='application/octet-stream',
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
+    return await _resume_response(request, application, key, 'application/octet-stream', filename=original_filename)
 
-@router.get("/{application_id}/resume/view")
-def view_resume(
+@router.api_route("/{application_id}/resume/view", methods=["GET", "HEAD"])
+async def view_resume(
     application_id: int,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """View resume file for an application (opens in browser)"""
-    application = get_application(db, application_id=application_id)
-    if application is None:
-        raise HTTPException(status_code=404, detail="Application not found")
-    # Check if user has permission to view this resume
-    if not current_user.is_admin and application.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    if not application.resume_url:
-        raise HTTPException(status_code=404, detail="Resume not found")
-    # Extract filename from resume_url
-    filename = application.resume_url.split('/')[-1]
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Resume file not found")
+    application, key = await _get_resume_key(db, application_id, current_user)
     # Determine content type based on file extension
-    file_extension = os.path.splitext(filename)[1].lower()
-    content_type_map = {
-        '.pdf': 'application/pdf',
-        '.doc': 'application/msword',
-        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    }
-    content_type = content_type_map.get(file_extension, 'application/octet-stream')
-    return FileResponse(
-        path=file_path,
-        media_type=content_type,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
+    file_extension = os.path.splitext(key)[1].lower()
+    content_type = RESUME_CONTENT_TYPES.get(file_extension, 'application/octet-stream')
+    return await _resume_response(request, application, key, content_type, inline=True)
 
 @router.post("/", response_model=Application)
 async def create_job_application(
+    background_tasks: BackgroundTasks,
     job_id: int = Form(...),
     name: str = Form(...),
     email: str = Form(...),
     cover_letter: str = Form(None),
     resume: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Apply for a job with resume upload"""
     
@@ -153,18 +239,6 @@ async def create_job_application(
             detail="Only PDF, DOC, and DOCX files are allowed"
         )
     
-    # Save resume file
-    file_extension = os.path.splitext(resume.filename)[1]
-    filename = f"resume_{current_user.id}_{job_id}_{os.urandom(8).hex()}{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
-    
-    async with aiofiles.open(file_path, 'wb') as out_file:
-        content = await resume.read()
-        await out_file.write(content)
-    
-    resume_url = f"/uploads/{filename}"
-    
-    # Create application
     application_data = ApplicationCreate(
         job_id=job_id,
         name=name,
@@ -172,29 +246,62 @@ async def create_job_application(
         cover_letter=cover_letter
     )
     
+    # Stream resume into the content-addressed store
+    file_extension = os.path.splitext(resume.filename)[1]
     try:
-        application = create_application(
-            db=db, 
+        resume_url, resume_sha256, resume_size = await store_resume(resume, file_extension)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    # Create application
+    try:
+        application = await create_application_async(
+            db, 
             application=application_data, 
             user_id=current_user.id, 
-            resume_url=resume_url
+            resume_url=resume_url,
+            resume_sha256=resume_sha256,
+            resume_size=resume_size
         )
+        if settings.RESUME_TEXT_ENABLED:
+            # Queued once the response is sent; extraction runs off the request path
+            background_tasks.add_task(resume_indexer.enqueue, resume_sha256)
         return application
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
-        # Clean up uploaded file if application creation fails
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # The stored blob may be shared with other applications; an unreferenced
+        # one is removed by blobstore.collect_garbage
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.patch("/bulk", response_model=ApplicationBulkResult)
+async def update_application_statuses(
+    change: ApplicationBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Set the status of many applications at once (Admin only).
+
+    Pass either `ids` or `job_id`, and optionally `current_status` to only
+    change applications in that status (e.g. reject every pending applicant
+    of a job). All changes are applied in one transaction and reported per
+    application.
+    """
+    if (change.ids is None) == (change.job_id is None):
+        raise HTTPException(status_code=400, detail="Pass either ids or job_id")
+    if change.ids is not None and len(change.ids) > MAX_BULK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_IDS} ids per request")
+    return await update_applications_bulk_async(db, change, settings.BULK_BATCH_SIZE)
+
 @router.put("/{application_id}", response_model=Application)
-def update_application_status(
+async def update_application_status(
     application_id: int,
     application: ApplicationUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """Update application status (Admin only)"""
-    updated_application = update_application(db=db, application_id=application_id, application=application)
+    updated_application = await update_application_async(db, application_id=application_id, application=application)
     if updated_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return updated_application 
\ No newline at end of file
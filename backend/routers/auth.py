@@ -2,30 +2,45 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from database import get_db
-from auth import create_access_token
-from crud import create_user, get_user_by_email, authenticate_user
+from database import get_db, run_db
+from auth import Principal, create_access_token, token_claims, revoke_tokens, get_current_user
+from crud import create_user_async, get_user_by_email_async, authenticate_user
 from schemas import UserCreate, User, Token
 from config import settings
+from hashing import HashingBusy, password_hasher
 
 router = APIRouter()
 
+def _hashing_busy():
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many concurrent sign-in requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await get_user_by_email_async(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    return create_user(db=db, user=user)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except HashingBusy:
+        raise _hashing_busy()
+    return await create_user_async(db, user=user, hashed_password=hashed_password)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    try:
+        user = await authenticate_user(db, form_data.username, form_data.password)
+    except HashingBusy:
+        raise _hashing_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,6 +49,15 @@ def login_for_access_token(
         )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/revoke")
+async def revoke_all_tokens(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Sign out everywhere by revoking all tokens issued to the current user"""
+    await run_db(db, revoke_tokens, current_user.id)
+    return {"message": "All tokens revoked"} 
\ No newline at end of file
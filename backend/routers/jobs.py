@@ -1,74 +1,286 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from database import get_db
-from auth import get_current_user, get_current_admin_user
-from crud import get_jobs, get_job, create_job, update_job, delete_job
-from schemas import Job, JobCreate, JobUpdate, JobSearch
-from models import User
+from database import get_db, get_read_db
+from auth import Principal, get_current_user, get_current_admin_user
+from crud import (
+    get_jobs_async, get_jobs_after_async, get_job_summaries_async, get_job_summaries_after_async,
+    search_jobs_async, get_job_facets_async, get_jobs_version_async, get_job_async, get_similar_jobs_async, get_recommended_jobs_async,
+    create_job_async, update_job_async, delete_job_async
+)
+from schemas import (
+    Job, JobCreate, JobUpdate, JobSearch, JobPage, JobSearchResult, JobSummary, JobSummaryPage,
+    JobImportResult, JobFacets, SimilarJob
+)
+from pagination import decode_cursor, next_cursor
+from cache import cache_key, fold, job_cache
+from httpcache import is_not_modified, not_modified_response, weak_etag
+from config import settings
+import bulk
+from recommendations import IndexNotReady
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Job])
-def read_jobs(
+_job_list = TypeAdapter(List[Job])
+_job_search_results = TypeAdapter(List[JobSearchResult])
+_job_summaries = TypeAdapter(List[JobSummary])
+_similar_jobs = TypeAdapter(List[SimilarJob])
+
+JOBS_VERSION_KEY = cache_key("version")
+
+def _validator_headers(etag: str) -> dict:
+    # no-cache: clients may store the response but must revalidate it
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def _json_response(body: bytes, etag: Optional[str] = None) -> Response:
+    headers = _validator_headers(etag) if etag else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _jobs_etag(db, key: str) -> str:
+    """ETag of a cached job response: its cache key plus the jobs version token.
+
+    The token is cached with the responses, so it is recomputed only after
+    a job write or once per CACHE_TTL_SECONDS.
+    """
+    version = job_cache.get(JOBS_VERSION_KEY)
+    if version is None:
+        version = (await get_jobs_version_async(db)).encode()
+        job_cache.set(JOBS_VERSION_KEY, version)
+    return weak_etag(key, version)
+
+def _index_not_ready() -> HTTPException:
+    # Only until the worker has built its similar-jobs index at startup
+    return HTTPException(status_code=503, detail="Similar jobs are being indexed", headers={"Retry-After": "5"})
+
+def _similar_jobs_json(results) -> bytes:
+    return _similar_jobs.dump_json([
+        SimilarJob(**Job.model_validate(job).model_dump(), score=round(score, 4))
+        for job, score in results
+    ])
+
+@router.get("/", response_model=Union[List[Job], JobPage, List[JobSearchResult], List[JobSummary], JobSummaryPage])
+async def read_jobs(
+    request: Request,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    q: Optional[str] = Query(None, description="Full-text search over title and description"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination; pass an empty value for the first page"),
     location: Optional[str] = Query(None, description="Filter by location"),
     min_salary: Optional[float] = Query(None, description="Minimum salary"),
     max_salary: Optional[float] = Query(None, description="Maximum salary"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    lean: bool = Query(False, description="Return summary rows with the description truncated to snippet_length"),
+    snippet_length: int = Query(200, ge=0, le=10000, description="Description length in lean mode"),
+    db: Session = Depends(get_read_db)
+):
+    """Get all jobs with optional filtering.
+
+    With `q` set, returns matches ranked by relevance with highlighted title
+    and description snippet (paged with skip/limit). With `cursor` set,
+    returns a page ordered by creation time together with the `next_cursor`
+    to fetch the following page; otherwise uses skip/limit. `lean` selects
+    only the listed columns and serializes the rows directly, skipping ORM
+    objects entirely. Responses are served from the job cache when possible
+    and carry a weak ETag; a matching If-None-Match is answered with 304
+    before any query runs.
+    """
+    if lean and not q:
+        return await _read_job_summaries(request, skip, limit, cursor, snippet_length, location, min_salary,
+                                         max_salary, status, db)
+
+    key = cache_key("list", skip, limit, fold(q), cursor, fold(location), min_salary, max_salary, status)
+    etag = await _jobs_etag(db, key)
+    if is_not_modified(request, etag):
+        return not_modified_response(_validator_headers(etag))
+    body = job_cache.get(key)
+    if body is not None:
+        return _json_response(body, etag)
+
+    filters = dict(location=location, min_salary=min_salary, max_salary=max_salary, status=status)
+    if q:
+        results = await search_jobs_async(db, q=q, skip=skip, limit=limit, **filters)
+        body = _job_search_results.dump_json([
+            JobSearchResult(
+                **Job.model_validate(job).model_dump(),
+                rank=rank,
+                title_highlight=title_highlight,
+                snippet=snippet
+            )
+            for job, rank, title_highlight, snippet in results
+        ])
+    elif cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        jobs = await get_jobs_after_async(db, after=after, limit=limit + 1, **filters)
+        body = JobPage(items=jobs[:limit], next_cursor=next_cursor(jobs, limit)).model_dump_json().encode()
+    else:
+        jobs = await get_jobs_async(db, skip=skip, limit=limit, **filters)
+        body = _job_list.dump_json(_job_list.validate_python(jobs, from_attributes=True))
+
+    job_cache.set(key, body)
+    return _json_response(body, etag)
+
+async def _read_job_summaries(request, skip, limit, cursor, snippet_length, location, min_salary,
+                              max_salary, status, db):
+    key = cache_key("lean", skip, limit, cursor, snippet_length, fold(location), min_salary, max_salary, status)
+    etag = await _jobs_etag(db, key)
+    if is_not_modified(request, etag):
+        return not_modified_response(_validator_headers(etag))
+    body = job_cache.get(key)
+    if body is not None:
+        return _json_response(body, etag)
+
+    filters = dict(location=location, min_salary=min_salary, max_salary=max_salary, status=status,
+                   snippet_length=snippet_length)
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = await get_job_summaries_after_async(db, after=after, limit=limit + 1, **filters)
+        # Rows are trusted database output, so build the page without re-validating them
+        page = JobSummaryPage.model_construct(
+            items=[row._asdict() for row in rows[:limit]],
+            next_cursor=next_cursor(rows, limit)
+        )
+        body = page.model_dump_json().encode()
+    else:
+        rows = await get_job_summaries_async(db, skip=skip, limit=limit, **filters)
+        body = _job_summaries.dump_json([row._asdict() for row in rows])
+
+    job_cache.set(key, body)
+    return _json_response(body, etag)
+
+@router.get("/facets", response_model=JobFacets)
+async def read_job_facets(db: Session = Depends(get_read_db)):
+    """Job counts per status, per location and per salary bucket.
+
+    Read from counters maintained on every job write rather than computed
+    with GROUP BY over the jobs table.
+    """
+    key = cache_key("facets")
+    body = job_cache.get(key)
+    if body is None:
+        body = JobFacets.model_validate(await get_job_facets_async(db)).model_dump_json().encode()
+        job_cache.set(key, body)
+    return _json_response(body)
+
+@router.post("/bulk", response_model=JobImportResult)
+async def bulk_import_jobs(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Body format; defaults to the Content-Type"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Import jobs from an NDJSON or CSV body (Admin only).
+
+    Rows with an `external_id` that already exists update that job. The body
+    is streamed and written in batches; invalid rows are skipped and
+    reported by line number.
+    """
+    fmt = format or bulk.format_for_content_type(request.headers.get("content-type", ""))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv, or pass format=ndjson|csv"
+        )
+    return await bulk.import_jobs(db, request.stream(), fmt, settings.BULK_BATCH_SIZE)
+
+@router.get("/export")
+async def export_jobs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
-    """Get all jobs with optional filtering"""
-    jobs = get_jobs(
-        db, 
-        skip=skip, 
-        limit=limit, 
-        location=location,
-        min_salary=min_salary,
-        max_salary=max_salary,
-        status=status
+    """Stream all jobs as NDJSON or CSV (Admin only)"""
+    return StreamingResponse(
+        bulk.export_jobs(format, settings.BULK_BATCH_SIZE),
+        media_type=bulk.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'}
     )
-    return jobs
+
+@router.get("/recommended", response_model=List[SimilarJob])
+async def read_recommended_jobs(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Active jobs most similar to the ones the current user applied for"""
+    try:
+        results = await get_recommended_jobs_async(db, user_id=current_user.id, limit=limit)
+    except IndexNotReady:
+        raise _index_not_ready()
+    return _json_response(_similar_jobs_json(results))
 
 @router.get("/{job_id}", response_model=Job)
-def read_job(job_id: int, db: Session = Depends(get_db)):
+async def read_job(job_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Get a specific job by ID"""
-    job = get_job(db, job_id=job_id)
-    if job is None:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    key = cache_key("detail", job_id)
+    etag = await _jobs_etag(db, key)
+    if is_not_modified(request, etag):
+        return not_modified_response(_validator_headers(etag))
+    body = job_cache.get(key)
+    if body is None:
+        job = await get_job_async(db, job_id=job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        body = Job.model_validate(job).model_dump_json().encode()
+        job_cache.set(key, body)
+    return _json_response(body, etag)
+
+@router.get("/{job_id}/similar", response_model=List[SimilarJob])
+async def read_similar_jobs(
+    job_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Active jobs whose title and description are most similar to this job's"""
+    key = cache_key("similar", job_id, limit)
+    body = job_cache.get(key)
+    if body is None:
+        try:
+            results = await get_similar_jobs_async(db, job_id=job_id, limit=limit)
+        except IndexNotReady:
+            raise _index_not_ready()
+        if results is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        body = _similar_jobs_json(results)
+        job_cache.set(key, body)
+    return _json_response(body)
 
 @router.post("/", response_model=Job)
-def create_new_job(
+async def create_new_job(
     job: JobCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """Create a new job (Admin only)"""
-    return create_job(db=db, job=job)
+    return await create_job_async(db, job=job)
 
 @router.put("/{job_id}", response_model=Job)
-def update_job_by_id(
+async def update_job_by_id(
     job_id: int,
     job: JobUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """Update a job (Admin only)"""
-    updated_job = update_job(db=db, job_id=job_id, job=job)
+    updated_job = await update_job_async(db, job_id=job_id, job=job)
     if updated_job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     return updated_job
 
 @router.delete("/{job_id}")
-def delete_job_by_id(
+async def delete_job_by_id(
     job_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """Delete a job (Admin only)"""
-    success = delete_job(db=db, job_id=job_id)
+    success = await delete_job_async(db, job_id=job_id)
     if not success:
         raise HTTPException(status_code=404, detail="Job not found")
     return {"message": "Job deleted successfully"} 
\ No newline at end of file
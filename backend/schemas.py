@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing_extensions import TypedDict
+from typing import Dict, Optional, List
 from datetime import datetime
 
 # User schemas
@@ -28,6 +29,9 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[int] = None
+    is_admin: Optional[bool] = None
+    token_version: Optional[int] = None
 
 # Job schemas
 class JobBase(BaseModel):
@@ -47,14 +51,70 @@ class JobUpdate(BaseModel):
     salary: Optional[float] = None
     status: Optional[str] = None
 
+class JobImport(JobCreate):
+    external_id: Optional[str] = None
+
+class JobImportError(BaseModel):
+    line: int
+    error: str
+
+class JobImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[JobImportError]
+
 class Job(JobBase):
     id: int
+    external_id: Optional[str] = None
+    application_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
+class JobSearchResult(Job):
+    rank: float
+    title_highlight: Optional[str] = None
+    snippet: Optional[str] = None
+
+class SimilarJob(Job):
+    score: float
+
+class JobPage(BaseModel):
+    items: List[Job]
+    next_cursor: Optional[str] = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SalaryBucket(BaseModel):
+    min: float
+    max: float
+    count: int
+
+class JobFacets(BaseModel):
+    status: List[FacetCount]
+    location: List[FacetCount]
+    salary: List[SalaryBucket]
+
+# Lean listing rows are plain dicts serialized straight from database rows,
+# so they are declared as a TypedDict rather than a model
+class JobSummary(TypedDict):
+    id: int
+    title: str
+    location: str
+    salary: float
+    status: str
+    description: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+class JobSummaryPage(BaseModel):
+    items: List[JobSummary]
+    next_cursor: Optional[str] = None
+
 # Application schemas
 class ApplicationBase(BaseModel):
     name: str
@@ -67,11 +127,29 @@ class ApplicationCreate(ApplicationBase):
 class ApplicationUpdate(BaseModel):
     status: str
 
+class ApplicationBulkUpdate(BaseModel):
+    """Target status for the listed applications or a job's applications, optionally only those in `current_status`."""
+    status: str
+    ids: Optional[List[int]] = None
+    job_id: Optional[int] = None
+    current_status: Optional[str] = None
+
+class ApplicationBulkItem(BaseModel):
+    id: int
+    result: str  # updated, unchanged, not_found
+
+class ApplicationBulkResult(BaseModel):
+    updated: int
+    unchanged: int
+    not_found: int
+    items: List[ApplicationBulkItem]
+
 class Application(ApplicationBase):
     id: int
     user_id: int
     job_id: int
     resume_url: str
+    resume_sha256: Optional[str] = None
     status: str
     created_at: datetime
     
@@ -84,6 +162,34 @@ class ApplicationWithJob(Application):
     class Config:
         from_attributes = True
 
+class ApplicationPage(BaseModel):
+    items: List[ApplicationWithJob]
+    next_cursor: Optional[str] = None
+
+class JobApplicationPage(BaseModel):
+    items: List[Application]
+    next_cursor: Optional[str] = None
+
+# Admin dashboard schemas
+class JobApplicationStats(BaseModel):
+    job_id: int
+    application_count: int
+    by_status: Dict[str, int]
+
+class TopJob(BaseModel):
+    id: int
+    title: str
+    application_count: int
+
+class AdminStats(BaseModel):
+    jobs: int
+    jobs_by_status: Dict[str, int]
+    applications: int
+    applications_by_status: Dict[str, int]
+    applications_last_24h: int
+    applications_last_7d: int
+    top_jobs: List[TopJob]
+
 # Search and filter schemas
 class JobSearch(BaseModel):
     location: Optional[str] = None
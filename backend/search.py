@@ -0,0 +1,208 @@
+import html
+import re
+from typing import List, Optional
+from sqlalchemy import bindparam, column, func, literal_column, select, table, text
+from sqlalchemy.orm import Session
+from database import is_postgres
+from models import Application, Job, ResumeText
+
+# Full-text search over job titles and descriptions.
+# PostgreSQL: a weighted tsvector generated column on jobs with a GIN index,
+# maintained by the database itself.
+# SQLite: an FTS5 virtual table keyed by job id, kept in sync from crud.
+# Extracted resume text (resumetext.py) is indexed the same way, keyed by the
+# resume's content hash.
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with private-use characters; render_highlight()
+# escapes the job text as HTML and only then turns them into <mark> tags
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+SNIPPET_WORDS = 24
+
+jobs_fts = table("jobs_fts", column("rowid"), column("title"), column("description"))
+resume_texts_fts = table("resume_texts_fts", column("sha256"), column("content"))
+
+def create_search_index(conn):
+    """Create the full-text index for jobs (idempotent) and backfill it."""
+    if is_postgres(conn):
+        conn.execute(text(
+            "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)"
+        ))
+    else:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts "
+            "USING fts5(title, description, tokenize='porter unicode61')"
+        ))
+        conn.execute(text(
+            "INSERT INTO jobs_fts(rowid, title, description) "
+            "SELECT id, title, description FROM jobs "
+            "WHERE id NOT IN (SELECT rowid FROM jobs_fts)"
+        ))
+
+def index_job(db: Session, job: Job):
+    """Add or refresh a job in the index. Must run after the job is flushed."""
+    if is_postgres(db.get_bind()):
+        return
+    remove_job(db, job.id)
+    db.execute(
+        text("INSERT INTO jobs_fts(rowid, title, description) VALUES (:id, :title, :description)"),
+        {"id": job.id, "title": job.title, "description": job.description}
+    )
+
+def index_jobs(db: Session, job_ids: List[int]):
+    """Add or refresh many jobs in the index with two set-based statements."""
+    if is_postgres(db.get_bind()) or not job_ids:
+        return
+    params = {"ids": list(job_ids)}
+    db.execute(
+        text("DELETE FROM jobs_fts WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+        params
+    )
+    db.execute(
+        text(
+            "INSERT INTO jobs_fts(rowid, title, description) "
+            "SELECT id, title, description FROM jobs WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        params
+    )
+
+def remove_job(db: Session, job_id: int):
+    if is_postgres(db.get_bind()):
+        return
+    db.execute(text("DELETE FROM jobs_fts WHERE rowid = :id"), {"id": job_id})
+
+def create_resume_search_index(conn):
+    """Create the full-text index for extracted resume text (idempotent) and backfill it."""
+    if is_postgres(conn):
+        conn.execute(text(
+            "ALTER TABLE resume_texts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_resume_texts_search_vector ON resume_texts USING GIN (search_vector)"
+        ))
+    else:
+        # Keyed by the blob hash, which FTS5 cannot use as its integer rowid
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS resume_texts_fts "
+            "USING fts5(sha256 UNINDEXED, content, tokenize='porter unicode61')"
+        ))
+        conn.execute(text(
+            "INSERT INTO resume_texts_fts(sha256, content) "
+            "SELECT sha256, content FROM resume_texts "
+            "WHERE content IS NOT NULL AND sha256 NOT IN (SELECT sha256 FROM resume_texts_fts)"
+        ))
+
+def index_resume_text(db: Session, sha256: str, content: str):
+    if is_postgres(db.get_bind()):
+        return
+    remove_resume_texts(db, [sha256])
+    db.execute(
+        text("INSERT INTO resume_texts_fts(sha256, content) VALUES (:sha256, :content)"),
+        {"sha256": sha256, "content": content}
+    )
+
+def remove_resume_texts(db: Session, sha256s: List[str]):
+    if is_postgres(db.get_bind()) or not sha256s:
+        return
+    db.execute(
+        text("DELETE FROM resume_texts_fts WHERE sha256 IN :sha256s")
+        .bindparams(bindparam("sha256s", expanding=True)),
+        {"sha256s": list(sha256s)}
+    )
+
+def resume_match(db: Session, q: str):
+    """Filter clause for applications whose resume text matches `q`, or None if `q` has no terms."""
+    if is_postgres(db.get_bind()):
+        prefix_query = _prefix_tsquery(q)
+        if prefix_query is None:
+            return None
+        tsquery = func.to_tsquery("english", prefix_query)
+        matching = select(ResumeText.sha256).where(literal_column("resume_texts.search_vector").op("@@")(tsquery))
+        return Application.resume_sha256.in_(matching)
+
+    match = _fts5_query(q)
+    if not match:
+        return None
+    matching = select(resume_texts_fts.c.sha256).where(literal_column("resume_texts_fts").op("MATCH")(match))
+    return Application.resume_sha256.in_(matching)
+
+def render_highlight(marked: Optional[str]) -> Optional[str]:
+    """HTML-safe highlight or snippet: escaped text with <mark> around the matches."""
+    if marked is None:
+        return None
+    escaped = html.escape(marked)
+    return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+def _prefix_tsquery(q: str) -> Optional[str]:
+    # to_tsquery() text matching like _fts5_query: every term required, the
+    # last one as a prefix; terms are word characters only, so never syntax
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " & ".join(terms[:-1] + [terms[-1] + ":*"])
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 syntax;
+    # the last term matches as a prefix to support search-as-you-type.
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def search_query(db: Session, q: str):
+    """Query of (Job, rank, title_highlight, snippet) matching `q`, best first.
+
+    Returns None when `q` contains no searchable terms.
+    """
+    if is_postgres(db.get_bind()):
+        # Same matching as SQLite: every term required, the last as a prefix
+        prefix_query = _prefix_tsquery(q)
+        if prefix_query is None:
+            return None
+        tsquery = func.to_tsquery("english", prefix_query)
+        search_vector = literal_column("jobs.search_vector")
+        options = (
+            f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, "
+            f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+        )
+        rank = func.ts_rank_cd(search_vector, tsquery)
+        return (
+            db.query(
+                Job,
+                rank.label("rank"),
+                func.ts_headline("english", Job.title, tsquery, options).label("title_highlight"),
+                func.ts_headline("english", Job.description, tsquery, options).label("snippet"),
+            )
+            .filter(search_vector.op("@@")(tsquery))
+            .order_by(rank.desc(), Job.id)
+        )
+
+    match = _fts5_query(q)
+    if not match:
+        return None
+    fts = literal_column("jobs_fts")
+    # bm25() is lower-is-better; title matches weigh more than description ones
+    bm25 = func.bm25(fts, 10.0, 1.0)
+    return (
+        db.query(
+            Job,
+            (-bm25).label("rank"),
+            func.highlight(fts, 0, _MATCH_START, _MATCH_END).label("title_highlight"),
+            func.snippet(fts, 1, _MATCH_START, _MATCH_END, "…", SNIPPET_WORDS).label("snippet"),
+        )
+        .join(jobs_fts, jobs_fts.c.rowid == Job.id)
+        .filter(fts.op("MATCH")(match))
+        .order_by(bm25, Job.id)
+    )
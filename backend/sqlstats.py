@@ -0,0 +1,61 @@
+import logging
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import event
+
+# Per-request SQL statistics.
+# Cursor execution events on the engines add to the QueryStats of the current
+# context, which the request middleware (or a test) opens with count_queries().
+# The stats object is shared by reference, so queries run in the threadpool or
+# through AsyncSession.run_sync are counted too.
+
+logger = logging.getLogger(__name__)
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_tracked = weakref.WeakSet()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def track_queries(engine, slow_query_ms: float = 0,
+                  observe: Optional[Callable[[float], None]] = None):
+    """Attach the counting hooks to a sync Engine (or an AsyncEngine's sync_engine).
+
+    `observe` is called with every statement's duration in seconds, and
+    statements slower than `slow_query_ms` are logged as warnings.
+    """
+    if engine in _tracked:
+        return
+    _tracked.add(engine)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += duration
+        if observe is not None:
+            observe(duration)
+        if slow_query_ms and duration * 1000 >= slow_query_ms:
+            logger.warning("Slow query (%.1f ms): %s", duration * 1000, " ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed in this context into a QueryStats."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
@@ -0,0 +1,170 @@
+import os
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+from config import settings
+
+# Resume file storage backends.
+# Objects are addressed by a relative key such as "blobs/ab/<sha256>.pdf".
+# LocalStorage keeps them under UPLOAD_DIR; S3Storage keeps them in any
+# S3-compatible object store (AWS S3, MinIO, moto) and hands out presigned
+# URLs so API replicas don't proxy file bytes.
+
+def content_disposition(filename: Optional[str], inline: bool) -> str:
+    disposition = "inline" if inline else "attachment"
+    if filename:
+        disposition += f"; filename*=utf-8''{quote(filename)}"
+    return disposition
+
+class LocalStorage:
+    def __init__(self, root: str):
+        self.root = root
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path for `key`, or None if it would escape the storage root."""
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, key))
+        if os.path.commonpath([root, path]) != root:
+            return None
+        return path
+
+    def exists(self, key: str) -> bool:
+        path = self.local_path(key)
+        return path is not None and os.path.isfile(path)
+
+    def size(self, key: str) -> Optional[int]:
+        return os.path.getsize(self.local_path(key)) if self.exists(key) else None
+
+    def put_file(self, src_path: str, key: str):
+        """Move a local file into storage. `src_path` is consumed."""
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(src_path, path)
+
+    def touch(self, key: str):
+        os.utime(self.local_path(key))
+
+    def delete(self, key: str):
+        path = self.local_path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def iter_objects(self, prefix: str) -> Iterator[Tuple[str, int, float]]:
+        """Yield (key, size, modified timestamp) for every object under `prefix`."""
+        base = self.local_path(prefix)
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                yield key, stat.st_size, stat.st_mtime
+
+    def read_chunks(self, key: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        with open(self.local_path(key), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def presigned_url(self, key: str, filename: Optional[str] = None,
+                      content_type: Optional[str] = None, inline: bool = False) -> Optional[str]:
+        return None
+
+class S3Storage:
+    def __init__(self, client, bucket: str, presign: bool = True, presign_expires: int = 300):
+        self.client = client
+        self.bucket = bucket
+        self.presign = presign
+        self.presign_expires = presign_expires
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def put_file(self, src_path: str, key: str):
+        """Upload a local file (multipart for large files). `src_path` is consumed."""
+        self.client.upload_file(src_path, self.bucket, key)
+        os.remove(src_path)
+
+    def touch(self, key: str):
+        # Copying an object onto itself refreshes LastModified, which GC uses.
+        # REPLACE drops whatever is not passed again, so carry the headers over
+        head = self.client.head_object(Bucket=self.bucket, Key=key)
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            MetadataDirective="REPLACE",
+            ContentType=head.get("ContentType", "binary/octet-stream"),
+            Metadata=head.get("Metadata", {})
+        )
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def iter_objects(self, prefix: str) -> Iterator[Tuple[str, int, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["Size"], obj["LastModified"].timestamp()
+
+    def size(self, key: str) -> Optional[int]:
+        """Size of `key` in bytes, or None if it does not exist."""
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def read_chunks(self, key: str, chunk_size: int = 64 * 1024,
+                    start: Optional[int] = None, end: Optional[int] = None) -> Iterator[bytes]:
+        """Stream `key`, or only bytes `start` to `end` (inclusive) of it."""
+        params = {"Bucket": self.bucket, "Key": key}
+        if start is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(**params)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def presigned_url(self, key: str, filename: Optional[str] = None,
+                      content_type: Optional[str] = None, inline: bool = False) -> Optional[str]:
+        if not self.presign:
+            return None
+        params = {
+            "Bucket": self.bucket,
+            "Key": key,
+            "ResponseContentDisposition": content_disposition(filename, inline),
+        }
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.presign_expires
+        )
+
+def build_storage():
+    if settings.STORAGE_BACKEND == "s3":
+        import boto3
+        client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            region_name=settings.S3_REGION or None
+        )
+        return S3Storage(
+            client,
+            settings.S3_BUCKET,
+            presign=settings.S3_PRESIGNED_URLS,
+            presign_expires=settings.S3_PRESIGN_EXPIRES_SECONDS
+        )
+    return LocalStorage(settings.UPLOAD_DIR)
+
+resume_storage = build_storage()
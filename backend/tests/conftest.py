@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import uuid
+import pytest
+
+# Point the app at a throwaway SQLite database and upload directory before any
+# backend module reads its settings. Run from the backend directory:
+#     python -m pytest tests
+_tmp = tempfile.mkdtemp(prefix="job_board_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+os.environ["SIMILAR_JOBS_INDEX_PATH"] = ""
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["RESUME_TEXT_ENABLED"] = "false"
+os.environ["SQL_DEBUG_HEADERS"] = "true"
+os.environ["BCRYPT_ROUNDS"] = "4"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from auth import get_password_hash
+from database import SessionLocal
+from main import app
+from models import User
+
+PASSWORD = "secret"
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs the lifespan, which migrates the database
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def _login(client, email):
+    response = client.post("/auth/token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture
+def make_user(client, db):
+    """Create a user and return auth headers for it."""
+    def make(is_admin=False):
+        email = f"{uuid.uuid4().hex}@example.com"
+        db.add(User(email=email, username=email, hashed_password=get_password_hash(PASSWORD), is_admin=is_admin))
+        db.commit()
+        return _login(client, email)
+    return make
+
+@pytest.fixture
+def admin_headers(make_user):
+    return make_user(is_admin=True)
+
+@pytest.fixture
+def make_job(client, admin_headers):
+    def make(**fields):
+        job = {"title": "Backend Engineer", "description": "Python and SQL", "location": "Remote",
+               "salary": 100000, **fields}
+        response = client.post("/jobs/", json=job, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return make
+
+@pytest.fixture
+def apply(client):
+    def apply(headers, job_id, filename="resume.pdf", content=b"%PDF-1.4 resume"):
+        return client.post(
+            "/applications/",
+            data={"job_id": str(job_id), "name": "Applicant", "email": "applicant@example.com"},
+            files={"resume": (filename, content, "application/pdf")},
+            headers=headers
+        )
+    return apply
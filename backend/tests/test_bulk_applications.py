@@ -0,0 +1,63 @@
+import pytest
+
+@pytest.fixture
+def job_with_applications(make_job, make_user, apply):
+    job = make_job()
+    ids = [apply(make_user(), job["id"]).json()["id"] for _ in range(3)]
+    return job, ids
+
+def bulk(client, headers, **change):
+    response = client.patch("/applications/bulk", json=change, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def stats(client, headers, job_id):
+    return client.get(f"/admin/stats/jobs/{job_id}", headers=headers).json()["by_status"]
+
+def test_results_per_id(client, admin_headers, job_with_applications):
+    job, ids = job_with_applications
+    bulk(client, admin_headers, ids=[ids[0]], status="rejected")
+    result = bulk(client, admin_headers, ids=[ids[0], ids[1], 999999, ids[1]], status="rejected")
+    assert (result["updated"], result["unchanged"], result["not_found"]) == (1, 1, 1)
+    # Duplicate ids are reported once, in request order
+    assert result["items"] == [
+        {"id": ids[0], "result": "unchanged"},
+        {"id": ids[1], "result": "updated"},
+        {"id": 999999, "result": "not_found"},
+    ]
+
+def test_current_status_filters_listed_ids(client, admin_headers, job_with_applications):
+    job, ids = job_with_applications
+    bulk(client, admin_headers, ids=[ids[0]], status="rejected")
+    result = bulk(client, admin_headers, ids=ids, status="accepted", current_status="pending")
+    assert result["items"] == [
+        {"id": ids[0], "result": "unchanged"},
+        {"id": ids[1], "result": "updated"},
+        {"id": ids[2], "result": "updated"},
+    ]
+    assert client.get(f"/applications/{ids[0]}", headers=admin_headers).json()["status"] == "rejected"
+
+def test_job_selection_and_counters(client, admin_headers, job_with_applications):
+    job, ids = job_with_applications
+    assert stats(client, admin_headers, job["id"]) == {"pending": 3}
+    bulk(client, admin_headers, ids=[ids[0]], status="reviewed")
+    assert stats(client, admin_headers, job["id"]) == {"pending": 2, "reviewed": 1}
+
+    result = bulk(client, admin_headers, job_id=job["id"], current_status="pending", status="rejected")
+    assert result["updated"] == 2
+    assert [item["id"] for item in result["items"]] == ids[1:]
+    assert stats(client, admin_headers, job["id"]) == {"reviewed": 1, "rejected": 2}
+
+    result = bulk(client, admin_headers, job_id=job["id"], status="rejected")
+    assert (result["updated"], result["unchanged"]) == (1, 2)
+    assert stats(client, admin_headers, job["id"]) == {"rejected": 3}
+
+@pytest.mark.parametrize("change", [
+    {"status": "rejected"},
+    {"status": "rejected", "ids": [1], "job_id": 1},
+])
+def test_ids_or_job_id_required(client, admin_headers, change):
+    assert client.patch("/applications/bulk", json=change, headers=admin_headers).status_code == 400
+
+def test_admin_only(client, make_user):
+    assert client.patch("/applications/bulk", json={"ids": [1], "status": "x"}, headers=make_user()).status_code == 403
@@ -0,0 +1,100 @@
+import fakeredis
+import pytest
+from cache import LRUCache, RedisCache, cache_key, fold
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+def test_redis_get_set(redis_client):
+    cache = RedisCache(redis_client, "jobs", ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", b"body")
+    assert cache.get("a") == b"body"
+
+def test_redis_entries_expire(redis_client):
+    cache = RedisCache(redis_client, "jobs", ttl=30)
+    cache.set("a", b"body")
+    assert 0 < redis_client.ttl("jobs:0:a") <= 30
+
+def test_redis_invalidate_bumps_generation(redis_client):
+    cache = RedisCache(redis_client, "jobs")
+    other_replica = RedisCache(redis_client, "jobs")
+    cache.set("a", b"old")
+    other_replica.invalidate()
+    assert cache.get("a") is None
+    cache.set("a", b"new")
+    assert other_replica.get("a") == b"new"
+
+def test_redis_value_read_before_invalidation_is_not_cached_after_it(redis_client):
+    cache = RedisCache(redis_client, "jobs")
+    assert cache.get("a") is None
+    # A write lands while this request computes its response
+    cache.invalidate()
+    cache.set("a", b"stale")
+    assert cache.get("a") is None
+
+def test_redis_errors_are_cache_misses():
+    class Broken:
+        def get(self, key):
+            raise ConnectionError("down")
+        set = incr = get
+    cache = RedisCache(Broken(), "jobs")
+    assert cache.get("a") is None
+    cache.set("a", b"body")
+    cache.invalidate()
+
+def test_lru_value_read_before_invalidation_is_not_cached_after_it():
+    cache = LRUCache()
+    assert cache.get("a") is None
+    cache.invalidate()
+    cache.set("a", b"stale")
+    assert cache.get("a") is None
+
+def test_cache_key_keeps_case_of_exact_match_parameters():
+    assert cache_key("list", "ACTIVE") != cache_key("list", "active")
+    assert cache_key("list", fold("Berlin")) == cache_key("list", fold("BERLIN"))
+
+def test_status_filter_is_not_served_from_another_case(client, make_job, monkeypatch):
+    import routers.jobs
+    monkeypatch.setattr(routers.jobs, "job_cache", LRUCache())
+    job = make_job(status="active")
+    assert client.get("/jobs/", params={"status": "ACTIVE", "limit": 1000}).json() == []
+    listed = client.get("/jobs/", params={"status": "active", "limit": 1000}).json()
+    assert job["id"] in [row["id"] for row in listed]
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """One LRU cache behind both the job routes and crud's invalidation."""
+    import crud
+    import routers.jobs
+    cache = LRUCache()
+    monkeypatch.setattr(routers.jobs, "job_cache", cache)
+    monkeypatch.setattr(crud, "job_cache", cache)
+    return cache
+
+def test_job_detail_follows_application_count(client, shared_cache, make_job, make_user, apply, admin_headers):
+    job = make_job()
+    first = client.get(f"/jobs/{job['id']}")
+    assert first.json()["application_count"] == 0
+    assert apply(make_user(), job["id"]).status_code == 200
+
+    second = client.get(f"/jobs/{job['id']}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.json()["application_count"] == 1
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+def test_status_changes_invalidate_job_responses(client, shared_cache, make_job, make_user, apply, admin_headers):
+    job = make_job()
+    application = apply(make_user(), job["id"]).json()
+    key = cache_key("detail", job["id"])
+    client.get(f"/jobs/{job['id']}")
+    assert shared_cache.get(key) is not None
+    response = client.put(f"/applications/{application['id']}", json={"status": "reviewed"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert shared_cache.get(key) is None
+
+    client.get(f"/jobs/{job['id']}")
+    response = client.patch("/applications/bulk", json={"job_id": job["id"], "status": "rejected"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert shared_cache.get(key) is None
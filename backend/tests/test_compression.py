@@ -0,0 +1,77 @@
+import gzip
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from compression import CompressionMiddleware, negotiate_encoding
+
+BODY = {"items": [{"id": i, "title": "Backend Engineer"} for i in range(200)]}
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    def large():
+        return JSONResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"{i}\n" * 100 for i in range(20)), media_type="application/x-ndjson")
+
+    @app.get("/pdf")
+    def pdf():
+        return Response(b"%PDF" * 1000, media_type="application/pdf")
+
+    @app.get("/partial")
+    def partial():
+        return Response("x" * 1000, status_code=206, media_type="text/plain", headers={"Content-Range": "bytes 0-999/5000"})
+
+    return app
+
+# TestClient would transparently decode the body, so ask httpx not to
+client = TestClient(_app(), headers={"Accept-Encoding": "identity"})
+
+def _get(path, encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_negotiation():
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") == "br"
+
+def test_large_json_is_compressed():
+    response, raw = _get("/large", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-length"] == str(len(raw))
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(raw) == JSONResponse(BODY).body
+
+    response, raw = _get("/large", "br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == JSONResponse(BODY).body
+
+def test_streamed_body_is_compressed():
+    for encoding, decompress in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+        response, raw = _get("/stream", encoding)
+        assert response.headers["content-encoding"] == encoding
+        assert "content-length" not in response.headers
+        assert decompress(raw) == "".join(f"{i}\n" * 100 for i in range(20)).encode()
+
+def test_uncompressed_responses():
+    response, raw = _get("/small", "gzip")
+    assert "content-encoding" not in response.headers and raw == b'{"ok":true}'
+    for path in ("/pdf", "/partial"):
+        response, raw = _get(path, "gzip, br")
+        assert "content-encoding" not in response.headers
+        assert len(raw) in (4000, 1000)
+    response, raw = _get("/large", "identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert raw == JSONResponse(BODY).body
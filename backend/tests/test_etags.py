@@ -0,0 +1,23 @@
+# ETags change with every committed write, even several within the timestamp
+# resolution (one second on SQLite) or committed out of order.
+
+def test_job_list_etag_follows_writes_in_the_same_second(client, make_job, admin_headers):
+    first, second = make_job(title="First"), make_job(title="Second")
+    assert client.put(f"/jobs/{second['id']}", json={"title": "Second v2"}, headers=admin_headers).status_code == 200
+    etag = client.get("/jobs/", params={"limit": 1000}).headers["ETag"]
+    assert client.put(f"/jobs/{first['id']}", json={"title": "First v2"}, headers=admin_headers).status_code == 200
+
+    response = client.get("/jobs/", params={"limit": 1000}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "First v2" in [job["title"] for job in response.json()]
+    assert client.get("/jobs/", params={"limit": 1000}, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+def test_application_list_etag_follows_status_changes(client, make_job, make_user, apply, admin_headers):
+    applicant = make_user()
+    application = apply(applicant, make_job()["id"]).json()
+    etag = client.get("/applications/", headers=applicant).headers["ETag"]
+    assert client.get("/applications/", headers={**applicant, "If-None-Match": etag}).status_code == 304
+    client.put(f"/applications/{application['id']}", json={"status": "reviewed"}, headers=admin_headers)
+    response = client.get("/applications/", headers={**applicant, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "reviewed"
@@ -0,0 +1,29 @@
+from sqlalchemy import select, update
+import facets
+from models import Job
+
+def _updated_at(db, job_id):
+    db.expire_all()
+    return db.scalar(select(Job.updated_at).where(Job.id == job_id))
+
+def test_applying_keeps_the_job_updated_at(db, make_job, make_user, apply):
+    job = make_job()
+    assert _updated_at(db, job["id"]) is None
+    assert apply(make_user(), job["id"]).status_code == 200
+    assert _updated_at(db, job["id"]) is None
+    assert db.scalar(select(Job.application_count).where(Job.id == job["id"])) == 1
+
+def test_reconcile_only_touches_drifted_counts(db, make_job, make_user, apply):
+    job, drifted = make_job(), make_job()
+    assert apply(make_user(), job["id"]).status_code == 200
+    facets.reconcile(db)
+    db.commit()
+    db.execute(update(Job).where(Job.id == drifted["id"]).values(application_count=5, updated_at=Job.updated_at))
+    db.commit()
+
+    assert facets.reconcile(db)["jobs"] == 1
+    db.commit()
+    assert db.scalar(select(Job.application_count).where(Job.id == drifted["id"])) == 0
+    assert db.scalar(select(Job.application_count).where(Job.id == job["id"])) == 1
+    assert _updated_at(db, job["id"]) is None
+    assert _updated_at(db, drifted["id"]) is None
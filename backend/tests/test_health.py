@@ -0,0 +1,26 @@
+import time
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import health
+from config import settings
+
+def test_ready(client):
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["database"]["ok"]
+
+@pytest.mark.skipif(health.ping_engine is None, reason="async mode pings through the async engine")
+def test_blocked_ping_gives_up_within_the_latency_budget(client):
+    held = health.ping_engine.connect()
+    try:
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert not response.json()["checks"]["database"]["ok"]
+        # The threadpool ping itself stops waiting too, not only the request
+        started = time.perf_counter()
+        with pytest.raises(PoolTimeoutError):
+            health._ping()
+        assert time.perf_counter() - started < settings.HEALTH_MAX_DB_LATENCY_MS / 1000 + 0.5
+    finally:
+        held.close()
+    assert client.get("/health/ready").status_code == 200
@@ -0,0 +1,14 @@
+from prometheus_client import REGISTRY
+from database import async_engine
+
+# Requests check connections out of the async engine when DATABASE_ASYNC is set
+REQUEST_ENGINE = "sync" if async_engine is None else "async"
+
+def _checkout_count(engine_name):
+    return REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"engine": engine_name}) or 0
+
+def test_pool_checkouts_are_timed(client):
+    before = _checkout_count(REQUEST_ENGINE)
+    assert client.get("/jobs/", params={"limit": 1}).status_code == 200
+    assert _checkout_count(REQUEST_ENGINE) > before
+    assert b"db_pool_checkout_wait_seconds_bucket" in client.get("/metrics").content
@@ -0,0 +1,28 @@
+import threading
+from sqlalchemy import create_engine, text
+from migrations import MIGRATIONS, migrate
+
+def test_concurrent_migrations_apply_each_version_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/concurrent.db", connect_args={"timeout": 30})
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(migrate(engine))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert sorted(version for applied in results for version in applied) == versions
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM schema_migrations")).scalar() == len(versions)
+        # The lock is released
+        assert conn.execute(text("SELECT count(*) FROM schema_migrations_lock")).scalar() == 0
+    assert migrate(engine) == []
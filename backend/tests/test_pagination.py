@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import update
+from models import Job
+
+def _pages(client, params):
+    ids, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/jobs/", params={**params, "cursor": cursor, "limit": 1}).json()
+        ids += [job["id"] for job in page["items"]]
+        cursor = page["next_cursor"]
+    return ids
+
+def test_cursor_pages_split_rows_created_in_the_same_second(client, db, make_job):
+    location = uuid.uuid4().hex
+    ids = [make_job(location=location, status="active")["id"] for _ in range(3)]
+    db.execute(update(Job).where(Job.id.in_(ids)).values(created_at=datetime(2024, 1, 1, 12, 0, 0)))
+    db.commit()
+    assert _pages(client, {"location": location}) == ids
+    assert _pages(client, {"location": location, "status": "active", "lean": "true"}) == ids
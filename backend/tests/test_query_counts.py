@@ -0,0 +1,34 @@
+import pytest
+
+# The application listings issue a fixed number of SQL statements no matter
+# how many rows a page holds (no N+1 loading of jobs). The counts come from
+# the X-SQL-Query-Count header (SQL_DEBUG_HEADERS=true in conftest):
+#   GET /applications/          change counters (ETag), one page query
+#   GET /applications/job/{id}  one page query
+
+@pytest.fixture
+def applicants(make_user, make_job, apply):
+    """Three applicants, each with applications to two jobs."""
+    jobs = [make_job(title=f"Engineer {i}") for i in range(2)]
+    users = [make_user() for _ in range(3)]
+    for headers in users:
+        for job in jobs:
+            assert apply(headers, job["id"]).status_code == 200
+    return jobs, users
+
+def query_count(response):
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-SQL-Query-Count"])
+
+def test_own_applications_query_count(client, applicants):
+    jobs, users = applicants
+    counts = {query_count(client.get("/applications/", headers=headers)) for headers in users}
+    assert counts == {2}
+    assert query_count(client.get("/applications/", params={"cursor": ""}, headers=users[0])) == 2
+
+def test_job_applications_query_count(client, applicants, admin_headers):
+    jobs, users = applicants
+    path = f"/applications/job/{jobs[0]['id']}"
+    assert query_count(client.get(path, headers=admin_headers)) == 1
+    assert query_count(client.get(path, params={"cursor": ""}, headers=admin_headers)) == 1
+    assert query_count(client.get(path, params={"status": "pending", "cursor": ""}, headers=admin_headers)) == 1
@@ -0,0 +1,124 @@
+import re
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from database import async_engine, engine
+from pagination import encode_cursor
+
+# Every SELECT an endpoint issues against jobs or applications must be answered
+# from an index: EXPLAIN QUERY PLAN may not show a SCAN of either table, be it
+# of the table or of a whole index. The one exception is a page read in index
+# order, which stops after LIMIT rows (the first page of a cursor listing).
+
+_full_scan = re.compile(r"\bSCAN (jobs|applications)\b")
+_ordered_walk = re.compile(r"\bSCAN (jobs|applications) USING (COVERING )?INDEX\b")
+_jobs_access = re.compile(r"\b(SCAN|SEARCH) jobs\b")
+
+# Requests run on the async engine when DATABASE_ASYNC is set
+_request_engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    for request_engine in _request_engines:
+        event.listen(request_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for request_engine in _request_engines:
+            event.remove(request_engine, "before_cursor_execute", capture)
+
+def query_plans(statements):
+    """(statement, plan details) of every captured statement."""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        return [
+            (statement, [row[-1] for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+    finally:
+        raw.close()
+
+def _limited_walk(statement, plan, detail):
+    return (
+        _ordered_walk.search(detail) and "LIMIT" in statement
+        and not any("TEMP B-TREE" in step for step in plan)
+    )
+
+def full_scans(statements):
+    return [
+        f"{detail}: {statement}"
+        for statement, plan in query_plans(statements)
+        for detail in plan
+        if _full_scan.search(detail) and not _limited_walk(statement, plan, detail)
+    ]
+
+def jobs_accesses(statements):
+    return [detail for _, plan in query_plans(statements) for detail in plan if _jobs_access.search(detail)]
+
+@pytest.fixture
+def job_with_applicant(make_job, make_user, apply):
+    job = make_job(status="active", location="Berlin", salary=90000)
+    assert apply(make_user(), job["id"]).status_code == 200
+    return job
+
+@pytest.mark.parametrize("path, params", [
+    ("/jobs/", {"status": "active"}),
+    ("/jobs/", {"status": "active", "min_salary": 50000, "max_salary": 150000}),
+    ("/jobs/", {"cursor": "", "limit": 10}),
+    ("/jobs/", {"lean": "true", "status": "active"}),
+    ("/jobs/", {"q": "python"}),
+    ("/jobs/facets", {}),
+])
+def test_job_listings_use_indexes(client, job_with_applicant, path, params):
+    with captured_selects() as statements:
+        assert client.get(path, params=params).status_code == 200
+    assert statements
+    assert full_scans(statements) == []
+
+@pytest.mark.parametrize("params", [
+    {"status": "active"},
+    {"status": "active", "min_salary": 50000, "max_salary": 150000},
+    {"location": "berl"},
+    {"location": "berl", "status": "active"},
+    {"cursor": encode_cursor(datetime(2000, 1, 1), 0), "limit": 10},
+    {"cursor": encode_cursor(datetime(2000, 1, 1), 0), "status": "active"},
+    {"lean": "true", "location": "berl", "cursor": encode_cursor(datetime(2000, 1, 1), 0)},
+])
+def test_filtered_and_cursor_listings_search_an_index(client, job_with_applicant, params):
+    with captured_selects() as statements:
+        response = client.get("/jobs/", params=params)
+    assert response.status_code == 200
+    accesses = jobs_accesses(statements)
+    assert accesses
+    assert all(detail.startswith("SEARCH jobs USING ") and "INDEX" in detail for detail in accesses), accesses
+
+def test_job_detail_uses_index(client, job_with_applicant):
+    with captured_selects() as statements:
+        assert client.get(f"/jobs/{job_with_applicant['id']}").status_code == 200
+    assert full_scans(statements) == []
+
+def test_application_endpoints_use_indexes(client, job_with_applicant, make_user, admin_headers, apply):
+    applicant = make_user()
+    with captured_selects() as statements:
+        assert apply(applicant, job_with_applicant["id"]).status_code == 200
+        # The duplicate check runs before the insert
+        assert apply(applicant, job_with_applicant["id"]).status_code == 400
+        assert client.get("/applications/", headers=applicant).status_code == 200
+        assert client.get("/applications/", params={"cursor": ""}, headers=applicant).status_code == 200
+        path = f"/applications/job/{job_with_applicant['id']}"
+        assert client.get(path, headers=admin_headers).status_code == 200
+        assert client.get(path, params={"status": "pending", "cursor": ""}, headers=admin_headers).status_code == 200
+    assert full_scans(statements) == []
+
+def test_apply_for_missing_job_is_404(make_user, apply):
+    response = apply(make_user(), 999999)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job not found"
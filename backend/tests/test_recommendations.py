@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from sqlalchemy import event, update
+import recommendations
+from database import engine
+from models import Job
+from recommendations import IndexNotReady, JobIndex, job_index
+
+JOBS = [
+    (1, "Python backend engineer", "Django, PostgreSQL and REST APIs", "active"),
+    (2, "Senior Python developer", "Backend services in Django and PostgreSQL", "active"),
+    (3, "Pastry chef", "Croissants, bread and cakes", "active"),
+    (4, "Python data engineer", "Spark pipelines and PostgreSQL", "closed"),
+]
+
+class _Rows:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def execute(self, query):
+        return [(job_id, title, description, status, None) for job_id, title, description, status in self.jobs]
+
+@pytest.fixture
+def index():
+    index = JobIndex(2 ** 18)
+    index.build(_Rows(JOBS))
+    return index
+
+def test_similar_ranks_related_active_jobs(index):
+    scored = index.similar(1, 10)
+    assert [job_id for job_id, _ in scored] == [2]
+    assert 0 < scored[0][1] <= 1
+    assert index.similar(99, 10) is None
+    assert [job_id for job_id, _ in index.recommend([3], 10)] == []
+
+def test_changed_rows_score_like_merged_ones(index):
+    index.upsert(5, "Backend engineer", "Python, Django and PostgreSQL", "active")
+    index.upsert(3, "Python chef", "Cooking for a Django meetup", "active")
+    index.remove(2)
+    pending = index.similar(1, 10)
+    assert index.changed
+    index._compact()
+    assert not index.changed and index.matrix.shape[0] == index.size
+    assert index.similar(1, 10) == pytest.approx(pending)
+    assert [job_id for job_id, _ in pending] == [5, 3]
+
+def test_upserts_are_merged_in_batches(index, monkeypatch):
+    monkeypatch.setattr(recommendations, "COMPACT_ROWS", 3)
+    for job_id in range(10, 13):
+        index.upsert(job_id, "Python engineer", "Django", "active")
+    assert not index.changed
+    assert index.matrix.shape[0] == index.size == 7
+
+def test_snapshot_round_trip(index, tmp_path):
+    index.upsert(5, "Backend engineer", "Python and Django", "active")
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = JobIndex(2 ** 18)
+    assert loaded.load(path)
+    assert loaded.similar(1, 10) == pytest.approx(index.similar(1, 10))
+    assert not JobIndex(512).load(path)
+    np.savez(str(tmp_path / "old.npz"), dimensions=np.int64(2 ** 18), matrix=np.zeros((0, 2 ** 18)))
+    assert not loaded.load(str(tmp_path / "old.npz"))
+
+def test_queries_wait_for_the_background_build(client, make_job):
+    assert not JobIndex(512).loaded
+    with pytest.raises(IndexNotReady):
+        JobIndex(512).ensure_current(None)
+    # The lifespan started the build, as the tests have no snapshot
+    job_index._builder.join(10)
+    assert job_index.loaded
+    first = make_job(title="Rust systems engineer", description="Rust, Tokio and embedded Linux")
+    second = make_job(title="Embedded Rust engineer", description="Rust firmware on Linux")
+    response = client.get(f"/jobs/{first['id']}/similar")
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == second["id"]
+
+def test_similar_jobs_are_unavailable_until_indexed(client, make_job, monkeypatch):
+    import crud
+    monkeypatch.setattr(crud, "job_index", JobIndex(512))
+    response = client.get(f"/jobs/{make_job()['id']}/similar")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+def test_sync_reads_changed_jobs_through_indexes(client, db, make_job, admin_headers):
+    edited = make_job(title="Go developer")
+    db.execute(update(Job).where(Job.id == edited["id"]).values(created_at=datetime(2020, 1, 1)))
+    db.commit()
+    index = JobIndex(512)
+    index.build(db)
+    created = make_job(title="Haskell developer")
+    response = client.put(f"/jobs/{edited['id']}", json={"title": "Go and Rust developer"}, headers=admin_headers)
+    assert response.status_code == 200
+    statements = []
+    capture = lambda conn, cursor, statement, parameters, context, many: statements.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert index.sync(db) >= 2
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    (statement, parameters), = statements
+    read = {row[0] for row in db.connection().exec_driver_sql(statement, parameters)}
+    assert {edited["id"], created["id"]} <= read
+    plan = [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    assert not any(detail.startswith("SCAN jobs") for detail in plan), plan
@@ -0,0 +1,40 @@
+import asyncio
+import time
+import pytest
+from config import settings
+from resumetext import ResumeIndexer
+
+def test_hung_extraction_is_killed(monkeypatch):
+    monkeypatch.setattr(settings, "RESUME_TEXT_TIMEOUT_SECONDS", 0.5)
+    indexer = ResumeIndexer(workers=1)
+    try:
+        assert indexer._run(pow, 2, 3) == 8
+        executor = indexer._get_executor()
+        processes = list(executor._processes.values())
+        with pytest.raises(TimeoutError):
+            indexer._run(time.sleep, 60)
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+        # The next extraction gets a fresh pool
+        assert indexer._run(pow, 3, 2) == 9
+        assert indexer._executor is not executor
+    finally:
+        indexer.shutdown()
+
+def test_aclose_waits_for_cancelled_consumers(monkeypatch):
+    indexer = ResumeIndexer(workers=2)
+    monkeypatch.setattr(indexer, "process", lambda sha256: time.sleep(0.2))
+
+    async def run():
+        for sha256 in ("a", "b", "c"):
+            await indexer.enqueue(sha256)
+        await asyncio.sleep(0.05)
+        tasks = indexer._tasks
+        await indexer.aclose()
+        return tasks
+
+    tasks = asyncio.run(run())
+    assert all(task.done() for task in tasks)
+    # Cancelled mid-item: task_done() on the consumer's own queue, no AttributeError
+    assert all(task.cancelled() for task in tasks)
@@ -0,0 +1,91 @@
+import time
+import boto3
+import pytest
+from moto import mock_aws
+from storage import S3Storage
+
+BUCKET = "test-resumes"
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Storage(client, BUCKET)
+
+def _put(storage, tmp_path, key, content=b"%PDF-1.4 resume"):
+    src = tmp_path / "upload.part"
+    src.write_bytes(content)
+    storage.put_file(str(src), key)
+    assert not src.exists()
+
+def test_put_get_exists_delete(s3, tmp_path):
+    key = "blobs/ab/abc.pdf"
+    assert not s3.exists(key)
+    _put(s3, tmp_path, key, b"x" * 200_000)
+    assert s3.exists(key)
+    assert b"".join(s3.read_chunks(key, chunk_size=64 * 1024)) == b"x" * 200_000
+    assert [(k, size) for k, size, _ in s3.iter_objects("blobs/")] == [(key, 200_000)]
+    s3.delete(key)
+    assert not s3.exists(key)
+
+def test_presigned_url(s3, tmp_path):
+    _put(s3, tmp_path, "blobs/ab/abc.pdf")
+    url = s3.presigned_url("blobs/ab/abc.pdf", filename="resume Jane.pdf", content_type="application/pdf", inline=True)
+    assert url.startswith(f"https://{BUCKET}.s3.amazonaws.com/blobs/ab/abc.pdf?")
+    assert "response-content-disposition=inline" in url
+    assert "response-content-type=application%2Fpdf" in url
+    assert S3Storage(s3.client, BUCKET, presign=False).presigned_url("blobs/ab/abc.pdf") is None
+
+def test_touch_keeps_content_type(s3, tmp_path):
+    key = "blobs/ab/abc.pdf"
+    s3.client.put_object(Bucket=BUCKET, Key=key, Body=b"%PDF", ContentType="application/pdf",
+                         Metadata={"sha256": "abc"})
+    before = s3.client.head_object(Bucket=BUCKET, Key=key)
+    time.sleep(1)
+    s3.touch(key)
+    after = s3.client.head_object(Bucket=BUCKET, Key=key)
+    assert after["LastModified"] > before["LastModified"]
+    assert after["ContentType"] == "application/pdf"
+    assert after["Metadata"] == {"sha256": "abc"}
+
+@pytest.fixture
+def proxied_resume(s3, monkeypatch, make_user, make_job, apply):
+    """An application whose resume is streamed through the API from S3."""
+    import blobstore
+    from routers import applications
+    storage = S3Storage(s3.client, BUCKET, presign=False)
+    monkeypatch.setattr(blobstore, "resume_storage", storage)
+    monkeypatch.setattr(applications, "resume_storage", storage)
+    headers = make_user()
+    content = bytes(range(256)) * 40
+    response = apply(headers, make_job()["id"], content=content)
+    assert response.status_code == 200, response.text
+    return f"/applications/{response.json()['id']}/resume/view", headers, content
+
+def test_proxied_resume_honours_range(client, proxied_resume):
+    path, headers, content = proxied_resume
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == content
+
+    response = client.get(path, headers={**headers, "Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+    assert response.content == content[100:200]
+
+    response = client.get(path, headers={**headers, "Range": "bytes=-10"})
+    assert response.status_code == 206
+    assert response.content == content[-10:]
+
+    response = client.get(path, headers={**headers, "Range": f"bytes={len(content)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+    # A changed representation (If-Range mismatch) is sent in full
+    response = client.get(path, headers={**headers, "Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == content
@@ -0,0 +1,35 @@
+import os
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from config import settings
+from uploads import UploadBodyLimit
+
+def test_oversized_upload_is_rejected_before_parsing(make_user, make_job, apply):
+    job = make_job()
+    content = b"%PDF-1.4 " + b"x" * (settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024 + 2 * 1024 * 1024)
+    response = apply(make_user(), job["id"], content=content)
+    assert response.status_code == 413
+    assert "maximum size" in response.json()["detail"]
+    # Nothing was written, not even a partial file
+    tmp_dir = os.path.join(settings.UPLOAD_DIR, "tmp")
+    assert not os.path.isdir(tmp_dir) or not os.listdir(tmp_dir)
+
+def _limited_app(max_bytes):
+    app = FastAPI()
+    app.add_middleware(UploadBodyLimit, max_bytes=max_bytes, paths=["/upload"])
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app
+
+def test_chunked_body_is_cut_off_at_the_limit():
+    client = TestClient(_limited_app(max_bytes=4096))
+    files = {"file": ("resume.pdf", b"x" * 1024, "application/pdf")}
+    assert client.post("/upload", files=files).json() == {"size": 1024}
+
+    body = b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"r.pdf\"\r\n\r\n" + b"x" * 8192 + b"\r\n--b--\r\n"
+    chunks = (body[i:i + 1024] for i in range(0, len(body), 1024))
+    response = client.post("/upload", content=chunks, headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
@@ -0,0 +1,86 @@
+import hashlib
+import os
+from typing import Iterable, Tuple
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Streaming upload handling.
+# Files are copied to a temporary file in fixed-size chunks and hashed on the
+# fly; callers rename the result into place once complete, so oversized or
+# aborted uploads never leave partial files behind. UploadBodyLimit caps the
+# whole request before Starlette parses (and spools) the multipart form.
+
+TEMP_SUFFIX = ".part"
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the maximum size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+async def stream_upload(upload: UploadFile, tmp_dir: str, max_bytes: int,
+                        chunk_size: int = 64 * 1024) -> Tuple[str, str, int]:
+    """Stream `upload` into a temporary file under `tmp_dir`.
+
+    Returns the temporary path, SHA-256 hex digest and size in bytes.
+    """
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{os.urandom(8).hex()}{TEMP_SUFFIX}")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out_file:
+            while chunk := await upload.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await out_file.write(chunk)
+    except BaseException:
+        if await aiofiles.os.path.exists(tmp_path):
+            await aiofiles.os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+# Headroom for the form fields and multipart framing around the file itself
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+class UploadBodyLimit:
+    """Reject upload requests whose body exceeds `max_bytes` with 413.
+
+    A declared Content-Length is checked before anything is read; chunked
+    bodies are counted as they arrive and cut off at the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        detail = f"Request body exceeds the maximum size of {self.max_bytes} bytes"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Re-raised by FastAPI's body parsing and answered as 413
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)